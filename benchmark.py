@@ -0,0 +1,364 @@
+"""
+Micro-benchmarks for the hot paths.
+
+    python benchmark.py            # run everything
+    python benchmark.py cache      # run one section
+"""
+import io
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import subprocess
+import types
+
+import numpy as np
+import pandas as pd
+
+from rich.console import Console
+from rich.segment import Segment
+
+from datetime import datetime, timezone
+
+from crypto_tracker.api.cache import CacheManager
+from crypto_tracker.api.binance import decode_klines, klines_to_frame, ms_to_local_time
+from crypto_tracker.api.candles import missing_ranges, rows_to_arrays, arrays_to_rows
+from crypto_tracker.ui.ascii_chart import AsciiCandleChart
+from crypto_tracker.ui.sizing import downsample_ohlc
+from crypto_tracker.utils import config, indicators
+from crypto_tracker.utils.indicator_engine import IndicatorEngine, COLUMNS as ENGINE_COLUMNS
+from crypto_tracker.utils.ticker_table import TickerTable
+
+def timed(func, repeat: int = 1) -> float:
+    """Average wall time of func() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def report(name: str, before_ms: float, after_ms: float):
+    speedup = before_ms / after_ms if after_ms else float('inf')
+    print(f"  {name:<28} before {before_ms:10.3f} ms   after {after_ms:10.3f} ms   x{speedup:,.1f}")
+
+class LegacyCache:
+    """The connect-per-call CacheManager this module replaced (default journaling)."""
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('CREATE TABLE coins (id TEXT PRIMARY KEY, symbol TEXT, name TEXT, rank INTEGER, '
+                         'source TEXT, last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+            conn.execute('CREATE TABLE favorites (id TEXT PRIMARY KEY)')
+
+    def save_coins(self, coins):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('INSERT OR REPLACE INTO coins (id, symbol, name, rank, source) '
+                             'VALUES (:id, :symbol, :name, :rank, :source)', coins)
+            conn.commit()
+
+    def add_favorite(self, coin_id):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('INSERT OR IGNORE INTO favorites (id) VALUES (?)', (coin_id,))
+            conn.commit()
+
+    def get_favorites(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[0] for row in conn.execute('SELECT id FROM favorites').fetchall()]
+
+    def get_coin(self, coin_id):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM coins WHERE id = ?', (coin_id,)).fetchone()
+            return dict(row) if row else None
+
+def bench_cache():
+    print("SQLite cache (15k coins, 2k point lookups)")
+    coins = [
+        {'id': f'coin-{i}', 'symbol': f'c{i}', 'name': f'Coin {i}', 'rank': i, 'source': 'coingecko'}
+        for i in range(15000)
+    ]
+    ids = [random.choice(coins)['id'] for _ in range(2000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyCache(os.path.join(tmp, 'legacy.db'))
+        current = CacheManager(os.path.join(tmp, 'current.db'))
+        for cache in (legacy, current):
+            for coin_id in ids[:20]:
+                cache.add_favorite(coin_id)
+
+        report("bulk insert (save_coins)",
+               timed(lambda: legacy.save_coins(coins), 3),
+               timed(lambda: current.save_coins(coins), 3))
+        renamed = [dict(c, name=c['name'] + ' v2') if i % 10 == 0 else c for i, c in enumerate(coins)]
+        report("re-save, 10% changed",
+               timed(lambda: legacy.save_coins(renamed)),
+               timed(lambda: current.save_coins(renamed)))
+        report("re-save, 1% changed",
+               timed(lambda: legacy.save_coins(coins[:150] + renamed[150:])),
+               timed(lambda: current.save_coins(coins[:150] + renamed[150:])))
+        # The search index followed every save
+        assert current.search_coins('in 1230 v2')[0]['id'] == 'coin-1230'
+        assert current.search_coins('coin 100 v2') == []
+        report("get_favorites x2000",
+               timed(lambda: [legacy.get_favorites() for _ in ids]),
+               timed(lambda: [current.get_favorites() for _ in ids]))
+        report("get_coin x2000",
+               timed(lambda: [legacy.get_coin(i) for i in ids]),
+               timed(lambda: [current.get_coin(i) for i in ids]))
+        current.close()
+
+def bench_search():
+    print("Coin search (shipped coins.db, per query)")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'coins.db')
+        with sqlite3.connect(config.DB_PATH) as src, sqlite3.connect(db_path) as dst:
+            src.backup(dst)
+        cache = CacheManager(db_path)
+
+        def legacy_search(query):
+            wildcard = f"%{query}%"
+            return cache.conn.execute(
+                'SELECT * FROM coins WHERE id LIKE ? OR symbol LIKE ? OR name LIKE ? ORDER BY rank ASC LIMIT 50',
+                (wildcard, wildcard, wildcard)
+            ).fetchall()
+
+        for query in ('b', 'eth', 'sol', 'bitcoin', 'coin'):
+            report(f"search '{query}'",
+                   timed(lambda: legacy_search(query), 50),
+                   timed(lambda: cache.search_coins(query), 50))
+        cache.close()
+
+def random_ohlcv(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.roll(close, 1) + rng.normal(0, 0.3, n)
+    high = np.maximum(open_, close) + rng.random(n)
+    low = np.minimum(open_, close) - rng.random(n)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.random(n) * 1000})
+
+def legacy_order_blocks(df: pd.DataFrame, lookback: int = 5) -> pd.DataFrame:
+    """The per-row loop calculate_order_blocks used before vectorization."""
+    df['bullish_ob'] = np.nan
+    df['bearish_ob'] = np.nan
+    for i in range(lookback, len(df) - 2):
+        if df['close'].iloc[i] > df['open'].iloc[i] and \
+           (df['close'].iloc[i] - df['open'].iloc[i]) > (df['high'].iloc[i-1] - df['low'].iloc[i-1]):
+            if df['close'].iloc[i-1] < df['open'].iloc[i-1]:
+                df.loc[df.index[i], 'bullish_ob'] = df['open'].iloc[i-1]
+        if df['close'].iloc[i] < df['open'].iloc[i] and \
+           (df['open'].iloc[i] - df['close'].iloc[i]) > (df['high'].iloc[i-1] - df['low'].iloc[i-1]):
+            if df['close'].iloc[i-1] > df['open'].iloc[i-1]:
+                df.loc[df.index[i], 'bearish_ob'] = df['open'].iloc[i-1]
+    df['bullish_ob'] = df['bullish_ob'].ffill()
+    df['bearish_ob'] = df['bearish_ob'].ffill()
+    return df
+
+def bench_order_blocks():
+    print("Order blocks (equivalence checked against the loop)")
+    for n in (0, 3, 8, 300, 5000):
+        df = random_ohlcv(n, seed=n)
+        expected = legacy_order_blocks(df.copy())
+        actual = indicators.calculate_order_blocks(df.copy())
+        for col in ('bullish_ob', 'bearish_ob'):
+            assert np.array_equal(expected[col].to_numpy(), actual[col].to_numpy(), equal_nan=True), (n, col)
+
+    df = random_ohlcv(5000)
+    report("5k candles",
+           timed(lambda: legacy_order_blocks(df.copy())),
+           timed(lambda: indicators.calculate_order_blocks(df.copy()), 20))
+    big = random_ohlcv(100_000)
+    print(f"  {'100k candles':<28} after  {timed(lambda: indicators.calculate_order_blocks(big.copy()), 5):10.3f} ms")
+
+def bench_engine():
+    print("Streaming indicator engine (checked against calculate_indicators)")
+    df = random_ohlcv(1000)
+    batch = indicators.calculate_indicators(df.copy())
+    engine = IndicatorEngine(max_rows=len(df)).seed(df.iloc[:-1])
+    last = df.iloc[-1]
+    # Revise the open candle a few times before settling on its final values
+    for bump in (1.01, 0.98, 1.0):
+        engine.update(len(df) - 1, last['open'], last['high'], last['low'], last['close'] * bump)
+    streamed = engine.frame()
+    for col in ENGINE_COLUMNS:
+        assert np.allclose(batch[col].to_numpy(), streamed[col].to_numpy(),
+                           rtol=1e-9, atol=1e-9, equal_nan=True), col
+    # A capped engine keeps only the newest rows, still matching the batch tail
+    capped = IndicatorEngine(max_rows=300).seed(df).frame()
+    for col in ENGINE_COLUMNS:
+        assert np.allclose(batch[col].to_numpy()[-300:], capped[col].to_numpy(),
+                           rtol=1e-9, atol=1e-9, equal_nan=True), col
+
+    report("1 candle tick (1k history)",
+           timed(lambda: indicators.calculate_indicators(df.copy()), 5),
+           timed(lambda: engine.update(len(df) - 1, last['open'], last['high'], last['low'], last['close']), 1000))
+
+def bench_batch():
+    print("Batched indicators, 100 symbols x 500 candles (checked per symbol)")
+    frames = [random_ohlcv(500 - (k % 5) * 60, seed=k) for k in range(100)]
+    stacked = {col: indicators.stack_series([f[col].to_numpy() for f in frames], 500)
+               for col in ('open', 'high', 'low', 'close')}
+    batch = lambda: indicators.calculate_indicators_batch(stacked['close'], stacked['high'],
+                                                          stacked['low'], stacked['open'])
+    result = batch()
+    for k, frame in enumerate(frames):
+        expected = indicators.calculate_indicators(frame.copy())
+        for col, values in result.items():
+            assert np.allclose(expected[col].to_numpy(), values[k, 500 - len(frame):],
+                               rtol=1e-9, atol=1e-8, equal_nan=True), (k, col)
+
+    report("all presets",
+           timed(lambda: [indicators.calculate_indicators(f.copy()) for f in frames], 2),
+           timed(batch, 5))
+
+# Commit the repo started from; old implementations are loaded from it
+# rather than copied in here.
+BASELINE = '56a68daa0e6e4346463660f81bfc0754b5f830f4'
+
+def baseline_module(path: str) -> types.ModuleType:
+    """Imports `path` as it was at BASELINE (needs a git checkout)."""
+    source = subprocess.run(['git', 'show', f'{BASELINE}:{path}'], capture_output=True,
+                            text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    module = types.ModuleType(f'baseline.{path}')
+    exec(compile(source, f'{BASELINE[:7]}:{path}', 'exec'), module.__dict__)
+    return module
+
+def rendered_segments(group, width: int = 140):
+    """Rendered (text, style) segments with equal-style neighbours merged."""
+    console = Console(width=width, file=io.StringIO(), force_terminal=True, color_system='truecolor')
+    return [(seg.text, str(seg.style)) for seg in Segment.simplify(console.render(group))]
+
+def bench_ascii_chart():
+    print("ASCII candle chart render (output checked against the list-of-lists canvas)")
+    legacy = baseline_module('crypto_tracker/ui/ascii_chart.py').AsciiCandleChart()
+    current = AsciiCandleChart()
+    cases = []
+    # Up to 100 candles (one per column) the default 100x24 canvas is unchanged
+    for n in (1, 2, 60, 99, 100):
+        df = indicators.calculate_indicators(random_ohlcv(n, seed=n))
+        cases.append(df)
+    gappy = indicators.calculate_indicators(random_ohlcv(100, seed=3))
+    gappy.loc[10:14, 'low'] = np.nan          # wick starts at row -1
+    gappy.loc[20:22, ['open', 'close']] = np.nan
+    gappy.loc[40:45, 'SMA_50'] = -1.0
+    cases.append(gappy)
+    everything = {'sma', 'ema', 'bb', 'rsi'}
+    for df in cases:
+        for inds, liq in ((everything, True), (set(), False), ({'bb'}, True)):
+            expected = rendered_segments(legacy.render(df, "BTC/USDT 1H", inds, liq))
+            actual = rendered_segments(current.render(df, "BTC/USDT 1H", inds, liq))
+            assert expected == actual, (len(df), inds, liq)
+
+    # Bucketed downsampling keeps every extreme; fitted output stays in bounds
+    df = indicators.calculate_indicators(random_ohlcv(5000, seed=5))
+    buckets = downsample_ohlc(df, 97)
+    assert buckets['high'].max() == df['high'].max() and buckets['low'].min() == df['low'].min()
+    assert np.isclose(buckets['volume'].sum(), df['volume'].sum())
+    for width, height in ((60, 12), (120, 30), (250, 60)):
+        lines = Console(width=width, file=io.StringIO()).render_lines(
+            current.render(df, "BTC/USDT 1H", everything, True, width=width, height=height))
+        assert len(lines) == height and all(Segment.get_line_length(l) <= width for l in lines), (width, height)
+
+    df = indicators.calculate_indicators(random_ohlcv(1000, seed=1000))
+    report("1 frame (1k candles, all on)",
+           timed(lambda: rendered_segments(legacy.render(df, "BTC/USDT 1H", everything, True)), 20),
+           timed(lambda: rendered_segments(current.render(df, "BTC/USDT 1H", everything, True)), 20))
+    report("render() only",
+           timed(lambda: legacy.render(df, "BTC/USDT 1H", everything, True), 20),
+           timed(lambda: current.render(df, "BTC/USDT 1H", everything, True), 20))
+
+def utc_ms(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+def bench_candles():
+    print("CandleStore gap detection and kline decoding (checked)")
+    hour = 3_600_000
+    stored = [utc_ms(2024, 3, 1) + i * hour for i in range(10) if i != 4]
+    assert missing_ranges(stored, stored[0], stored[-1] + hour, '1h') == [
+        (stored[0] + 4 * hour, stored[0] + 5 * hour - 1), (stored[-1] + hour, stored[-1] + hour)]
+    # '1M' candles open on the 1st of each month, not every 31 days
+    months = [utc_ms(2024, 1, 1), utc_ms(2024, 2, 1)]
+    assert missing_ranges(months, months[0], utc_ms(2024, 3, 15), '1M') == [
+        (utc_ms(2024, 3, 1), utc_ms(2024, 3, 15))]
+    assert missing_ranges([utc_ms(2023, 12, 1), utc_ms(2024, 2, 1)], utc_ms(2023, 12, 1),
+                          utc_ms(2024, 2, 20), '1M') == [(utc_ms(2024, 1, 1), utc_ms(2024, 2, 1) - 1)]
+    print("  missing_ranges               ok")
+
+    # A 5k-candle gap fetch decoded to columns: per-row tuples vs. decode_klines
+    page = [[utc_ms(2024, 1, 1) + i * hour, f"{100 + i % 7}.5", f"{101 + i % 7}.5", f"{99 + i % 7}.5",
+             f"{100 + i % 5}.25", "12.5", utc_ms(2024, 1, 1) + (i + 1) * hour - 1,
+             "1250.0", 42, "6.1", "610.0", "0"] for i in range(5000)]
+
+    def per_row():
+        rows = [(int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])) for k in page]
+        return rows, rows_to_arrays(rows)
+
+    (rows, arrays_a), arrays_b = per_row(), decode_klines(page)
+    assert rows == arrays_to_rows(arrays_b) and all(np.array_equal(arrays_a[c], arrays_b[c]) for c in arrays_a)
+    report("decode 5k klines", timed(per_row, 20), timed(lambda: decode_klines(page), 20))
+
+    # Chart frame as main.py used to build it: one dict per candle
+    def frame_per_row():
+        return pd.DataFrame([{'time': datetime.fromtimestamp(k[0] / 1000), 'open': float(k[1]),
+                              'high': float(k[2]), 'low': float(k[3]), 'close': float(k[4]),
+                              'volume': float(k[5])} for k in page[:1000]])
+
+    legacy, frame = frame_per_row(), klines_to_frame(decode_klines(page[:1000]))
+    assert (legacy['time'] == frame['time']).all() and np.array_equal(legacy['close'], frame['close'])
+    report("chart frame, 1k klines", timed(frame_per_row, 10),
+           timed(lambda: klines_to_frame(decode_klines(page[:1000])), 10))
+
+    # Local times stay right when the window spans two DST switches
+    if hasattr(time, 'tzset'):
+        saved = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+        try:
+            days = [utc_ms(2024, 2, 1) + i * 86_400_000 for i in range(300)]
+            assert list(ms_to_local_time(days)) == [datetime.fromtimestamp(t / 1000) for t in days]
+        finally:
+            if saved is None:
+                os.environ.pop('TZ')
+            else:
+                os.environ['TZ'] = saved
+            time.tzset()
+        print("  local time across DST       ok")
+
+def bench_movers():
+    print("Top 15 gainers / losers, 2000 USDT pairs (checked against a full sort)")
+    rng = np.random.default_rng(3)
+    tickers = [{'s': f"C{i}USDT", 'c': float(p), 'P': float(ch), 'q': float(q)}
+               for i, (p, ch, q) in enumerate(zip(rng.random(2000) * 100, rng.normal(0, 8, 2000),
+                                                  rng.random(2000) * 5e6))]
+    table = TickerTable()
+    table.update(tickers)
+
+    def full_sort(losers: bool):
+        liquid = [t for t in tickers if t['q'] >= config.MOVERS_MIN_QUOTE_VOLUME]
+        ordered = sorted(liquid, key=lambda t: t['P'], reverse=not losers)
+        return [t['s'] for t in ordered[:15]]
+
+    for losers in (False, True):
+        assert table.top_movers(15, losers, config.MOVERS_MIN_QUOTE_VOLUME) == full_sort(losers)
+
+    report("gainers + losers",
+           timed(lambda: (full_sort(False), full_sort(True)), 50),
+           timed(lambda: (table.top_movers(15, False, config.MOVERS_MIN_QUOTE_VOLUME),
+                          table.top_movers(15, True, config.MOVERS_MIN_QUOTE_VOLUME)), 50))
+
+SECTIONS = {
+    'cache': bench_cache,
+    'search': bench_search,
+    'order_blocks': bench_order_blocks,
+    'engine': bench_engine,
+    'batch': bench_batch,
+    'ascii_chart': bench_ascii_chart,
+    'movers': bench_movers,
+    'candles': bench_candles,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(SECTIONS)
+    for name in selected:
+        SECTIONS[name]()
@@ -1,56 +1,187 @@
-import aiohttp
 import asyncio
-from typing import List, Dict, Any
+import time
+from operator import itemgetter
+import numpy as np
+import pandas as pd
+from dateutil import tz
+from typing import List, Dict, Any, Optional, Union
 from crypto_tracker.utils import config
+from crypto_tracker.api.http_client import HttpClient, BaseAPI, json_loads
+from crypto_tracker.api.scheduler import PRIORITY_CHART, PRIORITY_SIDEBAR
 
-class BinanceAPI:
-    def __init__(self):
-        self.base_url = config.BINANCE_API_URL
-        self.session = None
+# Interval lengths in milliseconds ('1M' is approximated as 31 days, which
+# only ever makes range pages slightly smaller than the limit).
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+    '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000,
+    '1M': 31 * 86_400_000,
+}
+
+KLINE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+def decode_klines(raw: Union[List[List[Any]], bytes, str]) -> Dict[str, np.ndarray]:
+    """
+    Decodes a raw /klines payload (parsed list or JSON bytes) into contiguous
+    columns: 'open_time' as int64 epoch-ms and 'open', 'high', 'low',
+    'close', 'volume' as float64.
+    """
+    if isinstance(raw, (bytes, str)):
+        raw = json_loads(raw)
+    if not raw:
+        arrays = {'open_time': np.empty(0, dtype=np.int64)}
+        arrays.update({col: np.empty(0, dtype=np.float64) for col in KLINE_COLUMNS})
+        return arrays
+
+    # One column at a time straight into a preallocated array: no per-row
+    # slices, no intermediate 2-D table and float() is cheaper than NumPy's
+    # own string parsing
+    n = len(raw)
+    arrays = {'open_time': np.fromiter(map(itemgetter(0), raw), dtype=np.int64, count=n)}
+    for i, col in enumerate(KLINE_COLUMNS, 1):
+        arrays[col] = np.fromiter(map(float, map(itemgetter(i), raw)), dtype=np.float64, count=n)
+    return arrays
+
+def ms_to_local_time(epoch_ms) -> pd.DatetimeIndex:
+    """Epoch milliseconds -> naive local datetimes (what the charts display)."""
+    epoch_ms = np.asarray(epoch_ms, dtype=np.int64)
+    if len(epoch_ms) == 0:
+        return pd.DatetimeIndex([])
+    # gettz() loads the local zone's transition table, which pandas converts
+    # vectorized with the right offset on each side of every DST switch;
+    # tzlocal() (the fallback where there's no zoneinfo file) goes row by row
+    local = tz.gettz() or tz.tzlocal()
+    return pd.to_datetime(epoch_ms, unit='ms', utc=True).tz_convert(local).tz_localize(None)
 
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
+def klines_to_frame(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Chart DataFrame from decoded klines."""
+    frame = {'time': ms_to_local_time(arrays['open_time'])}
+    frame.update({col: arrays[col] for col in KLINE_COLUMNS})
+    frame['open_time'] = arrays['open_time']
+    return pd.DataFrame(frame)
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+def klines_weight(limit: int) -> int:
+    """Request weight Binance charges for /klines at a given limit."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
 
-    async def get_exchange_info(self) -> List[Dict[str, Any]]:
+class BinanceAPI(BaseAPI):
+    provider = 'binance'
+
+    def __init__(self, client: Optional[HttpClient] = None):
+        super().__init__(client)
+        self.base_url = config.BINANCE_API_URL
+
+    async def get_exchange_info(self, priority: int = PRIORITY_CHART) -> List[Dict[str, Any]]:
         """Fetches all trading pairs."""
-        url = f"{self.base_url}/exchangeInfo"
-        async with self.session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                symbols = data.get('symbols', [])
-                # Filter for USDT pairs
-                return [s for s in symbols if s['quoteAsset'] == 'USDT' and s['status'] == 'TRADING']
-            return []
+        data = await self._get_json('exchangeInfo', default={}, priority=priority, weight=20)
+        symbols = data.get('symbols', [])
+        # Filter for USDT pairs
+        return [s for s in symbols if s['quoteAsset'] == 'USDT' and s['status'] == 'TRADING']
 
-    async def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100) -> List[List[Any]]:
+    async def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100,
+                         start_time: Optional[int] = None, end_time: Optional[int] = None,
+                         priority: int = PRIORITY_CHART) -> List[List[Any]]:
         """
         Fetches candlestick data.
         Intervals: 1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 6h, 8h, 12h, 1d, 3d, 1w, 1M
+        start_time / end_time are epoch milliseconds (optional).
         """
-        url = f"{self.base_url}/klines"
         params = {
             'symbol': symbol,
             'interval': interval,
             'limit': limit
         }
-        async with self.session.get(url, params=params) as response:
-            if response.status == 200:
-                return await response.json()
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        if end_time is not None:
+            params['endTime'] = int(end_time)
+        # Windowed requests (CandleStore gap fills) are keyed by timestamps
+        # that never repeat; the candle store caches those, not the LRU
+        windowed = start_time is not None or end_time is not None
+        return await self._get_json('klines', params, default=[], priority=priority,
+                                    weight=klines_weight(limit),
+                                    endpoint='klines/range' if windowed else None)
+
+    async def get_klines_range(self, symbol: str, interval: str, start_time: int, end_time: int,
+                               page_limit: int = config.KLINE_PAGE_LIMIT,
+                               concurrency: int = config.KLINE_CONCURRENCY,
+                               priority: int = PRIORITY_CHART) -> List[List[Any]]:
+        """
+        Fetches every candle opening in [start_time, end_time] (epoch ms).
+        The window is split into startTime/endTime pages of `page_limit`
+        candles which are fetched concurrently (bounded by `concurrency`),
+        then stitched back in order with duplicate candles dropped.
+        """
+        step = INTERVAL_MS.get(interval)
+        if step is None:
+            raise ValueError(f"Unknown kline interval: {interval}")
+        if end_time < start_time:
             return []
 
-    async def get_ticker_24hr(self, symbol: str = None) -> Any:
+        # Small windows (e.g. a delta fetch) use a smaller, cheaper limit
+        page_limit = max(1, min(page_limit, (int(end_time) - int(start_time)) // step + 1))
+        page_span = step * page_limit
+        pages = []
+        page_start = int(start_time)
+        while page_start <= end_time:
+            page_end = min(page_start + page_span - 1, int(end_time))
+            pages.append((page_start, page_end))
+            page_start = page_end + 1
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_page(page):
+            async with semaphore:
+                return await self.get_klines(symbol, interval, limit=page_limit,
+                                             start_time=page[0], end_time=page[1],
+                                             priority=priority)
+
+        results = await asyncio.gather(*(fetch_page(p) for p in pages))
+
+        # Stitch pages in order; pages are disjoint so only boundary dupes can occur
+        candles = []
+        last_open = None
+        for page in results:
+            for k in page or []:
+                if last_open is not None and k[0] <= last_open:
+                    continue
+                candles.append(k)
+                last_open = k[0]
+        return candles
+
+    async def get_recent_klines(self, symbol: str, interval: str = '1h',
+                                count: int = config.KLINE_HISTORY,
+                                priority: int = PRIORITY_CHART) -> List[List[Any]]:
+        """Fetches the latest `count` candles, paginating past the 1000-candle cap."""
+        if count <= config.KLINE_PAGE_LIMIT:
+            return await self.get_klines(symbol, interval, limit=count, priority=priority)
+        end_time = int(time.time() * 1000)
+        start_time = end_time - INTERVAL_MS[interval] * count
+        candles = await self.get_klines_range(symbol, interval, start_time, end_time, priority=priority)
+        return candles[-count:]
+
+    async def get_ticker_24hr(self, symbol: str = None, priority: int = PRIORITY_SIDEBAR) -> Any:
         """Fetches 24hr ticker price change statistics."""
-        url = f"{self.base_url}/ticker/24hr"
         params = {}
         if symbol:
             params['symbol'] = symbol
         
-        async with self.session.get(url, params=params) as response:
-            if response.status == 200:
-                return await response.json()
-            return []
+        return await self._get_json('ticker/24hr', params, default=[], priority=priority,
+                                    weight=2 if symbol else 80)
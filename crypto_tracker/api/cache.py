@@ -1,18 +1,127 @@
 import sqlite3
 import json
-from typing import List, Dict, Optional
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
 from crypto_tracker.utils import config
 import os
 
+# Connection tuning (WAL lets readers run while a write is in progress)
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    f'PRAGMA cache_size=-{config.DB_CACHE_KB}',
+    'PRAGMA temp_store=MEMORY',
+)
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache hands back the already-prepared statement on every call.
+SQL_SAVE_COIN = '''
+    INSERT INTO coins (id, symbol, name, rank, source)
+    VALUES (:id, :symbol, :name, :rank, :source)
+    ON CONFLICT (id) DO UPDATE SET
+        symbol = excluded.symbol, name = excluded.name, rank = excluded.rank,
+        source = excluded.source, last_updated = CURRENT_TIMESTAMP
+'''
+SQL_COIN_FIELDS = 'SELECT id, symbol, name, rank, source FROM coins'
+SQL_CREATE_SYMBOL_INDEX = 'CREATE INDEX IF NOT EXISTS idx_coins_symbol ON coins (symbol COLLATE NOCASE)'
+SQL_ALL_COINS = 'SELECT * FROM coins ORDER BY rank ASC'
+SQL_GET_COIN = 'SELECT * FROM coins WHERE id = ?'
+# Search ranking: exact symbol, symbol prefix, name/id prefix, then any
+# substring match; ties broken by market-cap rank (unranked last).
+SEARCH_ORDER = '''
+    ORDER BY CASE
+        WHEN c.symbol = :q THEN 0
+        WHEN c.symbol LIKE :prefix ESCAPE '\\' THEN 1
+        WHEN c.name LIKE :prefix ESCAPE '\\' OR c.id LIKE :prefix ESCAPE '\\' THEN 2
+        ELSE 3
+    END, c.rank IS NULL, c.rank ASC
+    LIMIT :limit OFFSET :offset
+'''
+SQL_SEARCH_FTS = '''
+    SELECT c.id, c.symbol, c.name, c.rank, c.source, c.last_updated
+    FROM coins_fts JOIN coins c ON c.rowid = coins_fts.rowid
+    WHERE coins_fts MATCH :match
+''' + SEARCH_ORDER
+SQL_SEARCH_LIKE = '''
+    SELECT c.id, c.symbol, c.name, c.rank, c.source, c.last_updated
+    FROM coins c
+    WHERE c.id LIKE :wildcard ESCAPE '\\' OR c.symbol LIKE :wildcard ESCAPE '\\' OR c.name LIKE :wildcard ESCAPE '\\'
+''' + SEARCH_ORDER
+# Trigrams need 3+ characters; shorter queries use the symbol index
+SQL_SEARCH_SHORT = '''
+    SELECT c.id, c.symbol, c.name, c.rank, c.source, c.last_updated
+    FROM coins c
+    WHERE c.symbol LIKE :prefix ESCAPE '\\'
+    ORDER BY c.symbol = :q DESC, c.rank IS NULL, c.rank ASC
+    LIMIT :limit OFFSET :offset
+'''
+# Keep coins_fts in step with coins (see save_coins for large batches)
+SQL_FTS_TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS coins_fts_insert AFTER INSERT ON coins BEGIN
+        INSERT INTO coins_fts (rowid, id, symbol, name) VALUES (new.rowid, new.id, new.symbol, new.name);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS coins_fts_delete AFTER DELETE ON coins BEGIN
+        INSERT INTO coins_fts (coins_fts, rowid, id, symbol, name) VALUES ('delete', old.rowid, old.id, old.symbol, old.name);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS coins_fts_update AFTER UPDATE ON coins BEGIN
+        INSERT INTO coins_fts (coins_fts, rowid, id, symbol, name) VALUES ('delete', old.rowid, old.id, old.symbol, old.name);
+        INSERT INTO coins_fts (rowid, id, symbol, name) VALUES (new.rowid, new.id, new.symbol, new.name);
+    END
+    ''',
+)
+SQL_DROP_FTS_TRIGGERS = (
+    'DROP TRIGGER IF EXISTS coins_fts_insert',
+    'DROP TRIGGER IF EXISTS coins_fts_delete',
+    'DROP TRIGGER IF EXISTS coins_fts_update',
+)
+SQL_COUNT_FTS_TRIGGERS = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'coins\\_fts\\_%' ESCAPE '\\'"
+SQL_REBUILD_FTS = "INSERT INTO coins_fts (coins_fts) VALUES ('rebuild')"
+SQL_ADD_FAVORITE = 'INSERT OR IGNORE INTO favorites (id) VALUES (?)'
+SQL_REMOVE_FAVORITE = 'DELETE FROM favorites WHERE id = ?'
+SQL_FAVORITES = 'SELECT id FROM favorites'
+SQL_COUNT_COINS = 'SELECT COUNT(*) FROM coins'
+SQL_SAVE_CANDLE = '''
+    INSERT OR REPLACE INTO candles (symbol, interval, open_time, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_LOAD_CANDLES = '''
+    SELECT open_time, open, high, low, close, volume FROM candles
+    WHERE symbol = ? AND interval = ? AND open_time BETWEEN ? AND ?
+    ORDER BY open_time ASC
+'''
+SQL_SAVE_RESPONSE = 'INSERT OR REPLACE INTO responses (key, data, stored_at) VALUES (?, ?, ?)'
+SQL_GET_RESPONSE = 'SELECT data, stored_at FROM responses WHERE key = ?'
+
 class CacheManager:
-    def __init__(self):
-        self.db_path = config.DB_PATH
+    """
+    SQLite-backed store for coins, favorites, candles and cached responses.
+    Holds one long-lived WAL-mode connection; calls are serialized with a
+    lock so it can be shared with the AsyncCacheManager worker thread.
+    """
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or config.DB_PATH
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=config.DB_STATEMENT_CACHE
+        )
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
         self._init_db()
 
     def _init_db(self):
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self.conn:
+            cursor = self.conn.cursor()
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS coins (
                     id TEXT PRIMARY KEY,
@@ -23,62 +132,173 @@ class CacheManager:
                     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            cursor.execute(SQL_CREATE_SYMBOL_INDEX)
+            self._init_search_index(cursor)
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS favorites (
                     id TEXT PRIMARY KEY
                 )
             ''')
-            conn.commit()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS candles (
+                    symbol TEXT,
+                    interval TEXT,
+                    open_time INTEGER,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    PRIMARY KEY (symbol, interval, open_time)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    data TEXT,
+                    stored_at REAL
+                )
+            ''')
+
+    def _init_search_index(self, cursor):
+        """Full-text index over coins (trigram, so substrings match), kept in sync by triggers."""
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS coins_fts USING fts5(
+                    id, symbol, name,
+                    content='coins', content_rowid='rowid', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 / trigram support: search falls back to LIKE
+            self.has_fts = False
+            return
+        self.has_fts = True
+        # Coins written before the index or its triggers existed (e.g. the
+        # shipped database) get indexed once, here
+        triggers = cursor.execute(SQL_COUNT_FTS_TRIGGERS).fetchone()[0]
+        if triggers < len(SQL_FTS_TRIGGERS) and cursor.execute(SQL_COUNT_COINS).fetchone()[0]:
+            cursor.execute(SQL_REBUILD_FTS)
+        for sql in SQL_FTS_TRIGGERS:
+            cursor.execute(sql)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _query(self, sql: str, params=(), as_dict: bool = False) -> List:
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            if as_dict:
+                columns = [c[0] for c in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return cursor.fetchall()
 
     def save_coins(self, coins: List[Dict]):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            # coins format: [{'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin', 'rank': 1, 'source': 'coingecko'}]
-            cursor.executemany('''
-                INSERT OR REPLACE INTO coins (id, symbol, name, rank, source)
-                VALUES (:id, :symbol, :name, :rank, :source)
-            ''', coins)
-            conn.commit()
+        # coins format: [{'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin', 'rank': 1, 'source': 'coingecko'}]
+        with self._lock, self.conn:
+            # Re-downloaded lists are mostly unchanged; only write what differs
+            stored = {row[0]: row[1:] for row in self.conn.execute(SQL_COIN_FIELDS)}
+            changed = [c for c in coins
+                       if stored.get(c['id']) != (c['symbol'], c['name'], c['rank'], c['source'])]
+            if not self.has_fts or len(changed) < config.FTS_BULK_ROWS:
+                self.conn.executemany(SQL_SAVE_COIN, changed)
+                return
+            # The triggers' FTS delete + insert per row would cost several
+            # times the write itself; one rebuild is cheaper for big batches.
+            # All of it is one transaction, so the triggers are back on commit.
+            for sql in SQL_DROP_FTS_TRIGGERS:
+                self.conn.execute(sql)
+            self.conn.executemany(SQL_SAVE_COIN, changed)
+            self.conn.execute(SQL_REBUILD_FTS)
+            for sql in SQL_FTS_TRIGGERS:
+                self.conn.execute(sql)
 
     def get_all_coins(self) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM coins ORDER BY rank ASC')
-            return [dict(row) for row in cursor.fetchall()]
+        return self._query(SQL_ALL_COINS, as_dict=True)
+
+    def get_coin(self, coin_id: str) -> Optional[Dict]:
+        rows = self._query(SQL_GET_COIN, (coin_id,), as_dict=True)
+        return rows[0] if rows else None
     
-    def search_coins(self, query: str) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            wildcard = f"%{query}%"
-            cursor.execute('''
-                SELECT * FROM coins 
-                WHERE id LIKE ? OR symbol LIKE ? OR name LIKE ? 
-                ORDER BY rank ASC LIMIT 50
-            ''', (wildcard, wildcard, wildcard))
-            return [dict(row) for row in cursor.fetchall()]
+    def search_coins(self, query: str, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Ranked coin search, one page at a time."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        params = {
+            'q': query,
+            'prefix': escaped + '%',
+            'match': '"' + query.replace('"', '""') + '"',
+            'limit': limit,
+            'offset': offset
+        }
+        if len(query) < 3:
+            return self._query(SQL_SEARCH_SHORT, params, as_dict=True)
+        if self.has_fts:
+            return self._query(SQL_SEARCH_FTS, params, as_dict=True)
+        params['wildcard'] = '%' + escaped + '%'
+        return self._query(SQL_SEARCH_LIKE, params, as_dict=True)
 
     def add_favorite(self, coin_id: str):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('INSERT OR IGNORE INTO favorites (id) VALUES (?)', (coin_id,))
-            conn.commit()
+        with self._lock, self.conn:
+            self.conn.execute(SQL_ADD_FAVORITE, (coin_id,))
 
     def remove_favorite(self, coin_id: str):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM favorites WHERE id = ?', (coin_id,))
-            conn.commit()
+        with self._lock, self.conn:
+            self.conn.execute(SQL_REMOVE_FAVORITE, (coin_id,))
 
     def get_favorites(self) -> List[str]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT id FROM favorites')
-            return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in self._query(SQL_FAVORITES)]
 
     def is_cache_empty(self) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM coins')
-            return cursor.fetchone()[0] == 0
+        return self._query(SQL_COUNT_COINS)[0][0] == 0
+
+    def save_response(self, key: str, data: Any, stored_at: float):
+        """Persists a decoded REST response (disk tier of the response cache)."""
+        with self._lock, self.conn:
+            self.conn.execute(SQL_SAVE_RESPONSE, (key, json.dumps(data), stored_at))
+
+    def get_response(self, key: str) -> Optional[Tuple[Any, float]]:
+        rows = self._query(SQL_GET_RESPONSE, (key,))
+        if not rows:
+            return None
+        return json.loads(rows[0][0]), rows[0][1]
+
+    def save_candles(self, symbol: str, interval: str, rows: List[Tuple]):
+        """Stores closed candles: rows are (open_time, open, high, low, close, volume)."""
+        with self._lock, self.conn:
+            self.conn.executemany(SQL_SAVE_CANDLE, [(symbol, interval) + tuple(row) for row in rows])
+
+    def load_candles(self, symbol: str, interval: str, start_time: int, end_time: int) -> List[Tuple]:
+        """Closed candles opening in [start_time, end_time], oldest first."""
+        return self._query(SQL_LOAD_CANDLES, (symbol, interval, start_time, end_time))
+
+class AsyncCacheManager:
+    """
+    Async facade over CacheManager. Every call runs on one dedicated worker
+    thread, so SQLite I/O never blocks the asyncio loop:
+
+        favorites = await db.get_favorites()
+    """
+    def __init__(self, cache: CacheManager):
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self.cache, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        return call
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.cache.close()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+import numpy as np
+from typing import Dict, List, Tuple
+from crypto_tracker.api.binance import BinanceAPI, INTERVAL_MS, KLINE_COLUMNS, decode_klines
+from crypto_tracker.api.cache import AsyncCacheManager
+from crypto_tracker.api.http_client import HttpClient
+from crypto_tracker.api.scheduler import PRIORITY_CHART
+
+def rows_to_arrays(rows: List[Tuple]) -> Dict[str, np.ndarray]:
+    """(open_time, o, h, l, c, v) rows -> the same columns decode_klines returns."""
+    table = np.array(rows, dtype=np.float64).reshape(-1, 6)
+    arrays = {'open_time': table[:, 0].astype(np.int64)}
+    for i, col in enumerate(KLINE_COLUMNS):
+        arrays[col] = np.ascontiguousarray(table[:, i + 1])
+    return arrays
+
+MONTH_MIN_MS = 28 * 86_400_000  # shortest '1M' candle
+
+def next_open_time(open_time: int, interval: str) -> int:
+    """Open time of the candle after `open_time`; '1M' candles follow calendar months (UTC)."""
+    if interval != '1M':
+        return open_time + INTERVAL_MS[interval]
+    opened = datetime.fromtimestamp(open_time / 1000, tz=timezone.utc)
+    year, month = (opened.year + 1, 1) if opened.month == 12 else (opened.year, opened.month + 1)
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+def arrays_to_rows(arrays: Dict[str, np.ndarray]) -> List[Tuple]:
+    """Inverse of rows_to_arrays, zipped at C speed for executemany()."""
+    return list(zip(arrays['open_time'].tolist(), *(arrays[col].tolist() for col in KLINE_COLUMNS)))
+
+def concat_arrays(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    columns = ('open_time',) + tuple(KLINE_COLUMNS)
+    return {col: np.concatenate([p[col] for p in parts]) for col in columns}
+
+def missing_ranges(open_times: List[int], start_time: int, end_time: int, interval: str) -> List[Tuple[int, int]]:
+    """
+    Ranges inside [start_time, end_time] not covered by the sorted open_times
+    (at least one whole interval wide).
+    """
+    min_gap = MONTH_MIN_MS if interval == '1M' else INTERVAL_MS[interval]
+    gaps = []
+    cursor = start_time
+    for t in open_times:
+        if t - cursor >= min_gap:
+            gaps.append((cursor, t - 1))
+        cursor = max(cursor, next_open_time(t, interval))
+    if cursor <= end_time:
+        gaps.append((cursor, end_time))
+    return gaps
+
+class CandleStore:
+    """
+    Local OHLCV history. Closed candles are written permanently to the
+    `candles` table; the still-open candle only lives in memory. Reads fetch
+    just the ranges the DB doesn't have, so reopening a chart is a local
+    read plus one small delta request for the newest candles.
+    """
+    def __init__(self, db: AsyncCacheManager, client: HttpClient):
+        self.db = db
+        self.client = client
+        self._open: Dict[Tuple[str, str], Tuple] = {}         # still-open candle
+        self._first_open: Dict[Tuple[str, str], int] = {}     # listing start, if known
+
+    async def get_recent(self, symbol: str, interval: str, count: int,
+                         priority: int = PRIORITY_CHART) -> Dict[str, np.ndarray]:
+        """The latest `count` candles (including the open one)."""
+        step = INTERVAL_MS[interval]
+        now = int(time.time() * 1000)
+        start_time = (now // step - count + 1) * step
+        return await self.get_range(symbol, interval, start_time, now, priority=priority)
+
+    async def get_range(self, symbol: str, interval: str, start_time: int, end_time: int,
+                        priority: int = PRIORITY_CHART) -> Dict[str, np.ndarray]:
+        key = (symbol, interval)
+        step = INTERVAL_MS[interval]
+        start_time = max(start_time, self._first_open.get(key, start_time))
+
+        rows = await self.db.load_candles(symbol, interval, start_time, end_time)
+        gaps = missing_ranges([r[0] for r in rows], start_time, end_time, interval)
+        arrays = rows_to_arrays(rows)
+
+        if gaps:
+            async with BinanceAPI(self.client) as bn:
+                pages = await asyncio.gather(*(
+                    bn.get_klines_range(symbol, interval, g_start, g_end, priority=priority)
+                    for g_start, g_end in gaps
+                ))
+            fetched = concat_arrays([decode_klines(page) for page in pages])
+            times = fetched['open_time']
+            # Only the newest candle can still be open
+            if len(times) and next_open_time(int(times[-1]), interval) > int(time.time() * 1000):
+                self._open[key] = arrays_to_rows({col: values[-1:] for col, values in fetched.items()})[0]
+                fetched = {col: values[:-1] for col, values in fetched.items()}
+            if len(fetched['open_time']):
+                await self.db.save_candles(symbol, interval, arrays_to_rows(fetched))
+                # Fetched candles win over stored ones with the same open_time
+                merged = concat_arrays([fetched, arrays])
+                _, first = np.unique(merged['open_time'], return_index=True)
+                arrays = {col: values[first] for col, values in merged.items()}
+
+            # First candle arrived well after the requested start: the pair
+            # listed later, so don't ask for that empty stretch again
+            if gaps[0][0] == start_time and pages[0] and int(pages[0][0][0]) >= start_time + step:
+                self._first_open[key] = int(pages[0][0][0])
+
+        open_row = self._open.get(key)
+        if open_row is not None and start_time <= open_row[0] <= end_time:
+            if not len(arrays['open_time']) or open_row[0] > arrays['open_time'][-1]:
+                arrays = concat_arrays([arrays, rows_to_arrays([open_row])])
+        return arrays
+
+    async def ingest(self, symbol: str, interval: str, row: Tuple, closed: bool):
+        """Feeds a streamed candle: closed ones are persisted, open ones kept in memory."""
+        key = (symbol, interval)
+        if closed:
+            await self.db.save_candles(symbol, interval, [row])
+            if key in self._open and self._open[key][0] <= row[0]:
+                del self._open[key]
+        else:
+            self._open[key] = row
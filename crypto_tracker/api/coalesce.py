@@ -0,0 +1,42 @@
+import asyncio
+from typing import Dict, Any, Hashable, Callable, Awaitable, Optional
+
+def request_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+    """Order-independent key for an (endpoint, params) pair."""
+    return (endpoint, tuple(sorted((params or {}).items())))
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: concurrent callers with the same key
+    share one underlying task and all receive its result (or exception).
+    """
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.deduplicated += 1
+        # Shield so one caller being cancelled doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'deduplicated': self.deduplicated,
+            'inflight': len(self._inflight),
+            'dedup_ratio': self.deduplicated / self.calls if self.calls else 0.0
+        }
@@ -0,0 +1,225 @@
+import aiohttp
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Any, Optional, NamedTuple
+from crypto_tracker.utils import config
+from crypto_tracker.api.scheduler import RequestScheduler, PRIORITY_SIDEBAR
+from crypto_tracker.api.coalesce import SingleFlight, request_key
+from crypto_tracker.api.response_cache import ResponseCache, cache_key
+
+log = logging.getLogger(__name__)
+
+# Optional fast JSON backend
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+class HttpResponse(NamedTuple):
+    status: int
+    headers: Any
+    data: Any  # decoded JSON body, None unless status == 200
+    size: int = 0  # body size in bytes
+
+class HttpClient:
+    """
+    Long-lived, connection-pooled HTTP client shared by every API wrapper.
+    Keeps TCP/TLS connections alive between requests so switching coins or
+    timeframes doesn't pay a fresh handshake each time.
+    """
+    def __init__(self,
+                 limit: int = config.HTTP_MAX_CONNECTIONS,
+                 limit_per_host: int = config.HTTP_MAX_PER_HOST,
+                 keepalive_timeout: float = config.HTTP_KEEPALIVE_TIMEOUT,
+                 dns_cache_ttl: int = config.HTTP_DNS_CACHE_TTL,
+                 connect_timeout: float = config.HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = config.HTTP_READ_TIMEOUT,
+                 total_timeout: float = config.HTTP_TOTAL_TIMEOUT,
+                 cache: Optional[ResponseCache] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout
+        )
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.scheduler = RequestScheduler()
+        self.singleflight = SingleFlight()
+        self.cache = cache if cache is not None else ResponseCache()
+        self._background = set()  # stale-while-revalidate refresh tasks
+
+        # Counters
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.handshake_time = 0.0  # seconds spent opening new connections
+        self.background_errors = 0
+
+    async def start(self):
+        if self.session and not self.session.closed:
+            return self
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            trace_configs=[self._make_trace_config()]
+        )
+        return self
+
+    async def close(self):
+        for task in list(self._background):
+            task.cancel()
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> HttpResponse:
+        async with self.session.get(url, params=params) as response:
+            data = None
+            size = 0
+            if response.status == 200:
+                body = await response.read()
+                size = len(body)
+                data = json_loads(body)
+            return HttpResponse(response.status, response.headers, data, size)
+
+    def spawn(self, coro):
+        """Runs a fire-and-forget task that is cancelled when the client closes."""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+        return task
+
+    def _background_done(self, task: asyncio.Task):
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception() # retrieved, so asyncio doesn't report it at exit
+        if error is not None:
+            self.background_errors += 1
+            log.debug("background task failed", exc_info=error)
+
+    def _make_trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+            started = getattr(ctx, 'connect_started', None)
+            if started is not None:
+                self.handshake_time += time.perf_counter() - started
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.dns_cache_hits += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        return trace
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse and handshake counters."""
+        created = self.connections_created
+        return {
+            'requests': self.requests,
+            'connections_created': created,
+            'connections_reused': self.connections_reused,
+            'reuse_ratio': self.connections_reused / self.requests if self.requests else 0.0,
+            'dns_cache_hits': self.dns_cache_hits,
+            'handshake_time_ms': self.handshake_time * 1000,
+            'avg_handshake_ms': (self.handshake_time / created) * 1000 if created else 0.0,
+            'background_errors': self.background_errors
+        }
+
+class BaseAPI:
+    """
+    Common session handling for the REST wrappers.
+    Pass a shared HttpClient to reuse its pool; otherwise a private client is
+    opened on __aenter__ and closed on __aexit__ (standalone scripts).
+    """
+    provider = None  # scheduler budget this API draws from
+
+    def __init__(self, client: Optional[HttpClient] = None):
+        self.client = client
+        self._owns_client = client is None
+        self.session = None
+
+    async def __aenter__(self):
+        if self.client is None:
+            self.client = HttpClient()
+        await self.client.start()
+        self.session = self.client.session
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._owns_client and self.client:
+            await self.client.close()
+            self.client = None
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None, default: Any = None,
+                        priority: int = PRIORITY_SIDEBAR, weight: float = 1,
+                        endpoint: Optional[str] = None) -> Any:
+        """
+        GET base_url/path through the response cache and rate-limit scheduler;
+        `default` on failure. Identical concurrent calls share a single request.
+        `endpoint` names the cache policy when the path embeds an id.
+        """
+        endpoint = f"{self.provider}:{endpoint or path}"
+        key = cache_key(f"{self.provider}:{path}", params)
+        cache = self.client.cache
+
+        data, fresh = await cache.lookup(endpoint, key)
+        if data is not None:
+            if not fresh:
+                # Serve the stale copy now, refresh behind the scenes
+                self.client.spawn(self._fetch(path, params, priority, weight, endpoint, key))
+            return data
+
+        response = await self._fetch(path, params, priority, weight, endpoint, key)
+        if response.status == 200:
+            return response.data
+        return default
+
+    async def _fetch(self, path, params, priority, weight, endpoint, key) -> HttpResponse:
+        url = f"{self.base_url}/{path}"
+        client = self.client
+        response = await client.singleflight.do(
+            request_key(f"{self.provider}:{path}", params),
+            lambda: client.scheduler.request(
+                self.provider, priority,
+                lambda: client.get_json(url, params),
+                cost=weight
+            )
+        )
+        if response.status == 200:
+            await client.cache.put(endpoint, key, response.data)
+        return response
@@ -0,0 +1,124 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlencode
+from crypto_tracker.utils import config
+
+try:
+    import orjson
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    _dumps, _loads = json.dumps, json.loads
+
+def cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+class ResponseCache:
+    """
+    In-memory LRU cache of decoded REST responses, bounded by payload bytes.
+    Each endpoint has a (ttl, stale) policy: entries younger than ttl are
+    fresh; up to ttl + stale they are served immediately while the caller
+    revalidates in the background. Endpoints listed in RESPONSE_DISK_ENDPOINTS
+    are also written to the SQLite store so they survive restarts.
+
+    Entries are kept as encoded JSON and decoded on every hit, so each caller
+    gets its own copy and can't change what later callers are served.
+    """
+    def __init__(self, max_bytes: int = config.RESPONSE_CACHE_MAX_BYTES,
+                 policies: Dict[str, Tuple[float, float]] = None, store=None):
+        self.max_bytes = max_bytes
+        self.policies = policies if policies is not None else config.RESPONSE_TTLS
+        self.store = store  # AsyncCacheManager (optional disk tier)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict() # key -> (blob, size, stored_at)
+        self.size = 0
+
+        # Counters
+        self.hits = 0
+        self.stale_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def policy(self, endpoint: str) -> Optional[Tuple[float, float]]:
+        return self.policies.get(endpoint)
+
+    async def lookup(self, endpoint: str, key: str) -> Tuple[Any, bool]:
+        """
+        Returns (data, is_fresh). data is None on a miss or when the entry
+        is past its stale window.
+        """
+        policy = self.policy(endpoint)
+        if policy is None:
+            return None, False
+        ttl, stale = policy
+
+        entry = self._entries.get(key)
+        if entry is None and self.store is not None and endpoint in config.RESPONSE_DISK_ENDPOINTS:
+            row = await self.store.get_response(key)
+            if row is not None:
+                data, stored_at = row
+                entry = self._insert(key, _dumps(data), stored_at)
+                self.disk_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        blob, size, stored_at = entry
+        age = time.time() - stored_at
+        if age > ttl + stale:
+            self._drop(key)
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(key)
+        if age <= ttl:
+            self.hits += 1
+            return _loads(blob), True
+        self.stale_hits += 1
+        return _loads(blob), False
+
+    async def put(self, endpoint: str, key: str, data: Any):
+        if self.policy(endpoint) is None:
+            return
+        stored_at = time.time()
+        self._insert(key, _dumps(data), stored_at)
+        if self.store is not None and endpoint in config.RESPONSE_DISK_ENDPOINTS:
+            await self.store.save_response(key, data, stored_at)
+
+    def _insert(self, key: str, blob, stored_at: float):
+        self._drop(key)
+        size = len(blob)
+        if size > self.max_bytes:
+            return (blob, size, stored_at)  # too big to keep, still usable once
+        entry = (blob, size, stored_at)
+        self._entries[key] = entry
+        self.size += size
+        while self.size > self.max_bytes and self._entries:
+            _, (_, old_size, _) = self._entries.popitem(last=False)
+            self.size -= old_size
+            self.evictions += 1
+        return entry
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Callable, Awaitable
+from crypto_tracker.utils import config
+
+# Lower value = served first
+PRIORITY_CHART = 0      # chart for the coin on screen
+PRIORITY_SIDEBAR = 1    # watchlist / sidebar refresh
+PRIORITY_PREFETCH = 2   # background work nobody is waiting on
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate          # tokens per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 if available now)."""
+        self._refill()
+        cost = min(cost, self.capacity)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def consume(self, cost: float):
+        self._refill()
+        self.tokens -= min(cost, self.capacity)
+
+    def clamp(self, tokens: float):
+        """Never hold more tokens than the server says we have left."""
+        self._refill()
+        self.tokens = min(self.tokens, tokens)
+
+class ProviderLimiter:
+    """
+    Rate budget for one API provider: a token bucket plus a priority queue of
+    waiting requests and a cool-down window set by 429/418 responses.
+    """
+    def __init__(self, name: str, rate: float, capacity: float,
+                 weight_limit: Optional[int] = None, weight_safety: float = 1.0):
+        self.name = name
+        self.bucket = TokenBucket(rate, capacity)
+        self.weight_limit = weight_limit
+        self.weight_safety = weight_safety
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self.used_weight = None
+
+        self._waiters = []  # heap of (priority, seq, cost, future)
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._dispatcher = None
+
+        # Counters
+        self.granted = 0
+        self.throttled = 0
+        self.retried = 0
+
+    async def acquire(self, priority: int, cost: float = 1):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), cost, future))
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            priority, seq, cost, future = self._waiters[0]
+            if future.done():  # caller was cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+
+            wait = self.blocked_until - time.monotonic()
+            if wait <= 0:
+                wait = self.bucket.delay(cost)
+            if wait > 0:
+                # Sleep, but wake early if a more urgent request shows up
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._waiters)
+            self.bucket.consume(cost)
+            self.granted += 1
+            future.set_result(None)
+
+    def on_response(self, status: int, headers) -> Optional[float]:
+        """
+        Updates the budget from a response.
+        Returns the cool-down in seconds if the request should be retried.
+        """
+        self._read_weight(headers)
+
+        if status not in (429, 418):
+            self.backoff = 0.0
+            return None
+
+        self.throttled += 1
+        delay = _parse_retry_after(headers.get('Retry-After'))
+        if delay is None:
+            # Exponential backoff with jitter when the server gives no hint
+            self.backoff = min(config.RATE_LIMIT_MAX_BACKOFF, max(1.0, self.backoff * 2))
+            delay = self.backoff * random.uniform(1.0, 1.5)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        self.bucket.clamp(0)
+        return delay
+
+    def _read_weight(self, headers):
+        if not self.weight_limit:
+            return
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+        if used is None:
+            return
+        try:
+            self.used_weight = int(used)
+        except ValueError:
+            return
+        remaining = self.weight_limit * self.weight_safety - self.used_weight
+        self.bucket.clamp(remaining)
+        if remaining <= 0:
+            # Weight resets at the top of each minute
+            self.blocked_until = max(self.blocked_until, time.monotonic() + (60 - time.time() % 60))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'queued': sum(1 for w in self._waiters if not w[3].done()),
+            'granted': self.granted,
+            'throttled': self.throttled,
+            'retried': self.retried,
+            'tokens': round(self.bucket.tokens, 2),
+            'used_weight': self.used_weight,
+            'blocked_for': max(0.0, self.blocked_until - time.monotonic())
+        }
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RequestScheduler:
+    """Routes every REST call through its provider's budget, most urgent first."""
+    def __init__(self):
+        self.providers = {
+            'binance': ProviderLimiter(
+                'binance',
+                rate=config.BINANCE_WEIGHT_LIMIT * config.BINANCE_WEIGHT_SAFETY / 60,
+                capacity=config.BINANCE_WEIGHT_LIMIT * config.BINANCE_WEIGHT_SAFETY / 4,
+                weight_limit=config.BINANCE_WEIGHT_LIMIT,
+                weight_safety=config.BINANCE_WEIGHT_SAFETY
+            ),
+            'coingecko': ProviderLimiter(
+                'coingecko',
+                rate=config.COINGECKO_CALLS_PER_MIN / 60,
+                capacity=config.COINGECKO_BURST
+            )
+        }
+
+    async def request(self, provider: str, priority: int, send: Callable[[], Awaitable[Any]],
+                      cost: float = 1, retries: int = config.RATE_LIMIT_RETRIES):
+        """
+        Waits for budget, then awaits send() which must return an object with
+        `status` and `headers`. Throttled responses are retried after the
+        provider's cool-down; the last response is returned either way.
+        """
+        limiter = self.providers[provider]
+        attempt = 0
+        while True:
+            await limiter.acquire(priority, cost)
+            response = await send()
+            retry_in = limiter.on_response(response.status, response.headers)
+            if retry_in is None or attempt >= retries:
+                return response
+            attempt += 1
+            limiter.retried += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self.providers.items()}
@@ -1,11 +1,19 @@
-import math
 from rich.console import Group
 from rich.panel import Panel
-from rich.text import Text
+from rich.text import Text, Span
 from rich.layout import Layout
 from rich.align import Align
+from typing import Optional
 import pandas as pd
 import numpy as np
+from crypto_tracker.ui.sizing import SizedRenderable, downsample_ohlc
+
+# Canvas colour codes (index into this list)
+PALETTE = ["default", "red", "green", "yellow", "cyan", "magenta", "blue"]
+
+# Smallest canvas drawn when the region is tiny
+MIN_WIDTH = 10
+MIN_HEIGHT = 4
 
 class AsciiCandleChart:
     """
@@ -15,32 +23,28 @@ class AsciiCandleChart:
     def __init__(self):
         pass
 
-    def render(self, df: pd.DataFrame, title: str, active_indicators: set, show_liq_ob: bool = False) -> Group:
+    def sized(self, df: pd.DataFrame, title: str, active_indicators: set, show_liq_ob: bool = False) -> SizedRenderable:
+        """The chart fitted to whatever region it is placed in."""
+        return SizedRenderable(lambda width, height: self.render(
+            df, title, active_indicators, show_liq_ob, width=width, height=height
+        ))
+
+    def render(self, df: pd.DataFrame, title: str, active_indicators: set, show_liq_ob: bool = False,
+               width: Optional[int] = None, height: Optional[int] = None) -> Group:
+        """
+        width / height are the total size available (title, borders and
+        price labels included); without them the canvas is 100x24.
+        """
         if df.empty:
             return Group(Text("No data available"))
 
-        # Configuration
-        HEIGHT = 24
-        WIDTH = 100 
-        MAX_WIDTH = WIDTH - 1
-
-        # 1. Scaling / Sampling Logic
-        total_data_points = len(df)
-        
-        if total_data_points > WIDTH:
-            # Downsample: Pick 'WIDTH' indices evenly distributed
-            indices = np.linspace(0, total_data_points - 1, WIDTH).astype(int)
-            plot_df = df.iloc[indices].copy()
-        else:
-            plot_df = df.copy()
-
-        # Reset index to ensure we can iterate cleanly
-        plot_df.reset_index(drop=True, inplace=True)
-        final_count = len(plot_df)
+        # Configuration: title + top/bottom border take 3 lines
+        HEIGHT = max(MIN_HEIGHT, height - 3) if height else 24
 
-        # 2. Determine Y-Axis Range
-        valid_lows = plot_df['low'][plot_df['low'] > 0]
-        valid_highs = plot_df['high'][plot_df['high'] > 0]
+        # 1. Determine Y-Axis Range (bucketing keeps every high/low, so the
+        # full frame gives the same range as the plotted one)
+        valid_lows = df['low'][df['low'] > 0]
+        valid_highs = df['high'][df['high'] > 0]
         
         min_price = valid_lows.min() if not valid_lows.empty else 0
         max_price = valid_highs.max() if not valid_highs.empty else 100
@@ -53,28 +57,28 @@ class AsciiCandleChart:
         latest_bear_ob = None
 
         if show_liq_ob:
-             if 'liq_short' in plot_df.columns:
-                 valid = plot_df['liq_short'][plot_df['liq_short'] > 0]
+             if 'liq_short' in df.columns:
+                 valid = df['liq_short'][df['liq_short'] > 0]
                  if not valid.empty:
                      latest_liq_short = valid.iloc[-1]
                      max_price = max(max_price, latest_liq_short)
                      active_levels.append(f"[red]Liq Short: ${latest_liq_short:,.2f}[/red]")
                      
-             if 'liq_long' in plot_df.columns:
-                 valid = plot_df['liq_long'][plot_df['liq_long'] > 0]
+             if 'liq_long' in df.columns:
+                 valid = df['liq_long'][df['liq_long'] > 0]
                  if not valid.empty:
                      latest_liq_long = valid.iloc[-1]
                      min_price = min(min_price, latest_liq_long)
                      active_levels.append(f"[green]Liq Long: ${latest_liq_long:,.2f}[/green]")
             
-             if 'bullish_ob' in plot_df.columns:
-                 valid = plot_df['bullish_ob'].dropna()
+             if 'bullish_ob' in df.columns:
+                 valid = df['bullish_ob'].dropna()
                  if not valid.empty:
                      latest_bull_ob = valid.iloc[-1]
                      active_levels.append(f"[green]Bull OB: ${latest_bull_ob:,.2f}[/green]")
              
-             if 'bearish_ob' in plot_df.columns:
-                 valid = plot_df['bearish_ob'].dropna()
+             if 'bearish_ob' in df.columns:
+                 valid = df['bearish_ob'].dropna()
                  if not valid.empty:
                      latest_bear_ob = valid.iloc[-1]
                      active_levels.append(f"[red]Bear OB: ${latest_bear_ob:,.2f}[/red]")
@@ -87,56 +91,57 @@ class AsciiCandleChart:
         price_range = max_price - min_price
         if price_range <= 0: price_range = 1
 
-        def price_to_row(price):
-            if pd.isna(price) or price <= 0: return -1
-            ratio = (price - min_price) / price_range
-            row = int(ratio * (HEIGHT - 1))
-            return max(0, min(HEIGHT - 1, row))
+        # Price labels on every other row, right of the canvas
+        labels = {
+            r: f" {min_price + (r / (HEIGHT-1) * price_range):,.2f}"
+            for r in range(0, HEIGHT, 2)
+        }
+        if width:
+            label_width = max(len(label) for label in labels.values())
+            WIDTH = max(MIN_WIDTH, width - 2 - label_width)
+        else:
+            WIDTH = 100
+        MAX_WIDTH = WIDTH - 1
 
-        # Create Canvas
-        canvas = [[" " for _ in range(WIDTH)] for _ in range(HEIGHT)]
-        colors = [["default" for _ in range(WIDTH)] for _ in range(HEIGHT)]
+        # 2. Scaling: more candles than columns -> one OHLC bucket per column
+        plot_df = downsample_ohlc(df, WIDTH).reset_index(drop=True)
+        final_count = len(plot_df)
 
-        # LAYER 1: Draw Special Levels
-        if show_liq_ob:
-            if latest_liq_short is not None:
-                r = price_to_row(latest_liq_short)
-                if 0 <= r < HEIGHT:
-                    for c in range(WIDTH):
-                        canvas[r][c] = "─"
-                        colors[r][c] = "red"
+        def price_to_rows(prices):
+            # Missing / non-positive prices map to -1 (not drawn)
+            prices = np.asarray(prices, dtype=np.float64)
+            with np.errstate(invalid='ignore'):
+                ratio = (prices - min_price) / price_range
+                rows = np.clip(np.trunc(ratio * (HEIGHT - 1)), 0, HEIGHT - 1)
+            return np.where(prices > 0, rows, -1).astype(np.int64)
 
-            if latest_liq_long is not None:
-                r = price_to_row(latest_liq_long)
-                if 0 <= r < HEIGHT:
-                    for c in range(WIDTH):
-                        canvas[r][c] = "─"
-                        colors[r][c] = "green"
-            
-            if latest_bull_ob is not None:
-                r = price_to_row(latest_bull_ob)
-                if 0 <= r < HEIGHT:
-                    for c in range(WIDTH):
-                        canvas[r][c] = "="
-                        colors[r][c] = "green"
+        # Create Canvas: one character and one palette index per cell
+        canvas = np.full((HEIGHT, WIDTH), " ", dtype="<U1")
+        colors = np.zeros((HEIGHT, WIDTH), dtype=np.int8)
 
-            if latest_bear_ob is not None:
-                r = price_to_row(latest_bear_ob)
+        # LAYER 1: Draw Special Levels
+        if show_liq_ob:
+            levels = [
+                (latest_liq_short, "─", "red"),
+                (latest_liq_long, "─", "green"),
+                (latest_bull_ob, "=", "green"),
+                (latest_bear_ob, "=", "red"),
+            ]
+            for price, char, color in levels:
+                if price is None:
+                    continue
+                r = price_to_rows(price)
                 if 0 <= r < HEIGHT:
-                    for c in range(WIDTH):
-                        canvas[r][c] = "="
-                        colors[r][c] = "red"
+                    canvas[r, :] = char
+                    colors[r, :] = PALETTE.index(color)
 
         # Pre-calculate Screen X coordinates for all points
-        screen_xs = []
-        for i in range(final_count):
-            if final_count > 1:
-                # Using (final_count - 1) ensures the last point hits MAX_WIDTH
-                # This distributes candles evenly across the full width
-                scr_x = int((i / (final_count - 1)) * MAX_WIDTH)
-            else:
-                scr_x = MAX_WIDTH // 2
-            screen_xs.append(scr_x)
+        if final_count > 1:
+            # Using (final_count - 1) ensures the last point hits MAX_WIDTH
+            # This distributes candles evenly across the full width
+            screen_xs = ((np.arange(final_count) / (final_count - 1)) * MAX_WIDTH).astype(np.int64)
+        else:
+            screen_xs = np.full(final_count, MAX_WIDTH // 2, dtype=np.int64)
 
         # LAYER 2: Draw Indicators
         ind_chars = {
@@ -154,46 +159,35 @@ class AsciiCandleChart:
             if 'BB' in col_name and 'bb' in active_indicators: should_draw = True
             
             if should_draw and col_name in plot_df.columns:
-                for i, val in plot_df[col_name].items():
-                    if i >= len(screen_xs): continue
-                    r = price_to_row(val)
-                    col = screen_xs[i]
-                    if 0 <= r < HEIGHT and 0 <= col < WIDTH:
-                        canvas[r][col] = char
-                        colors[r][col] = color
+                rows = price_to_rows(plot_df[col_name].to_numpy(dtype=np.float64))
+                drawn = rows >= 0
+                canvas[rows[drawn], screen_xs[drawn]] = char
+                colors[rows[drawn], screen_xs[drawn]] = PALETTE.index(color)
 
         # LAYER 3: Draw Candles
-        for i, row in plot_df.iterrows():
-            if i >= len(screen_xs): continue
-            
-            o = row['open']
-            c = row['close']
-            h = row['high']
-            l = row['low']
-            
-            row_o = price_to_row(o)
-            row_c = price_to_row(c)
-            row_h = price_to_row(h)
-            row_l = price_to_row(l)
-            
-            if row_o == -1 or row_c == -1: continue
-            
-            col = screen_xs[i]
-            if not (0 <= col < WIDTH): continue
+        row_o = price_to_rows(plot_df['open'].to_numpy(dtype=np.float64))
+        row_c = price_to_rows(plot_df['close'].to_numpy(dtype=np.float64))
+        row_h = price_to_rows(plot_df['high'].to_numpy(dtype=np.float64))
+        row_l = price_to_rows(plot_df['low'].to_numpy(dtype=np.float64))
+        drawn = (row_o >= 0) & (row_c >= 0)
+        is_green = plot_df['close'].to_numpy() >= plot_df['open'].to_numpy()
 
-            is_green = c >= o
-            color = "green" if is_green else "red"
+        # (candle, row) cells painted by each candle's wick and body. A low of
+        # -1 makes the wick start at row -1, which wraps to the top row.
+        grid = np.arange(HEIGHT)
+        wick = (grid >= np.maximum(row_l, 0)[:, None]) & (grid <= row_h[:, None])
+        wick[:, HEIGHT - 1] |= row_l == -1
+        body = (grid >= np.minimum(row_o, row_c)[:, None]) & (grid <= np.maximum(row_o, row_c)[:, None])
+        painted = (wick | body) & drawn[:, None]
 
-            # Draw Wick
-            for r in range(row_l, row_h + 1):
-                canvas[r][col] = "│"
-                colors[r][col] = color
-                
-            # Draw Body
-            start, end = sorted([row_o, row_c])
-            for r in range(start, end + 1):
-                canvas[r][col] = "█" 
-                colors[r][col] = color
+        # Later candles overwrite earlier ones that share a screen column
+        owner = np.full((HEIGHT, WIDTH), -1, dtype=np.int64)
+        cand, rows = np.nonzero(painted)
+        np.maximum.at(owner, (rows, screen_xs[cand]), cand)
+        rows, cols = np.nonzero(owner >= 0)
+        winners = owner[rows, cols]
+        canvas[rows, cols] = np.where(body[winners, rows], "█", "│")
+        colors[rows, cols] = np.where(is_green[winners], PALETTE.index("green"), PALETTE.index("red"))
 
         # Build Final Output
         output_lines = []
@@ -206,15 +200,18 @@ class AsciiCandleChart:
         
         output_lines.append(Text("┌" + "─" * WIDTH + "┐"))
         
+        lines = canvas.view(f"<U{WIDTH}").ravel()
         for r in range(HEIGHT - 1, -1, -1):
-            row_text = Text("│")
-            for c in range(WIDTH):
-                row_text.append(canvas[r][c], style=colors[r][c])
-            row_text.append("│")
+            # One styled span per run of equal colour (offset by the left border)
+            bounds = np.flatnonzero(np.diff(colors[r])) + 1
+            starts = np.concatenate(([0], bounds)).tolist()
+            ends = np.concatenate((bounds, [WIDTH])).tolist()
+            codes = colors[r, starts].tolist()
+            spans = [Span(a + 1, b + 1, PALETTE[code]) for a, b, code in zip(starts, ends, codes)]
+            row_text = Text("│" + lines[r] + "│", spans=spans)
             
-            if r % 2 == 0:
-                price_label = min_price + (r / (HEIGHT-1) * price_range)
-                row_text.append(f" {price_label:,.2f}", style="white")
+            if r in labels:
+                row_text.append(labels[r], style="white")
                 
             output_lines.append(row_text)
             
@@ -6,15 +6,25 @@ from rich.layout import Layout
 from rich.panel import Panel
 from rich.text import Text
 import pandas as pd
+from crypto_tracker.ui.sizing import SizedRenderable, downsample_ohlc
 
 class PlotextChart:
     def __init__(self):
         self.decoder = AnsiDecoder()
 
-    def render(self, df: pd.DataFrame, title: str, chart_type: str = 'candle') -> Group:
+    def sized(self, df: pd.DataFrame, title: str, chart_type: str = 'candle') -> SizedRenderable:
+        """The chart fitted to whatever region it is placed in."""
+        return SizedRenderable(lambda width, height: self.render(
+            df, title, chart_type=chart_type, width=width, height=height or 20
+        ))
+
+    def render(self, df: pd.DataFrame, title: str, chart_type: str = 'candle',
+               width: int = 100, height: int = 20) -> Group:
         try:
+            # More candles than columns: aggregate so every high/low stays visible
+            df = downsample_ohlc(df, width)
             plt.clf()
-            plt.plotsize(100, 20)
+            plt.plotsize(width, height)
             plt.title(title)
             plt.theme('dark')
             
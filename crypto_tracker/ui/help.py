@@ -40,6 +40,7 @@ class HelpModal:
         table.add_row("V", "View Favorites", "List")
         table.add_row("T", "View Trending", "List")
         table.add_row("G/L", "View Gainers/Losers", "List")
+        table.add_row("N", "Market Screener (RSI / BB / Order Blocks)", "List")
 
         content = Group(
             Align.center("[bold]UNIVERSAL CRYPTO TRACKER HELP[/bold]"),
@@ -1,16 +1,31 @@
+import asyncio
 from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import FuzzyCompleter, WordCompleter
-from prompt_toolkit.shortcuts import prompt
-from typing import List, Dict, Optional
+from prompt_toolkit.completion import Completer, Completion, ThreadedCompleter
+from typing import Dict, Optional
+
+class CoinCompleter(Completer):
+    """Queries the indexed coin search on every keystroke instead of holding the whole list."""
+    def __init__(self, cache, page_size: int = 20):
+        self.cache = cache
+        self.page_size = page_size
+        self.seen: Dict[str, Dict] = {}  # display text -> coin
+
+    def get_completions(self, document, complete_event):
+        query = document.text_before_cursor
+        for coin in self.cache.search_coins(query, limit=self.page_size):
+            text = f"{coin['symbol'].upper()} - {coin['name']}"
+            self.seen[text] = coin
+            rank = coin.get('rank')
+            meta = f"#{rank}" if rank and rank < 999999 else ""
+            yield Completion(text, start_position=-len(query), display_meta=meta)
 
 class SearchModal:
-    def __init__(self, coin_list: List[Dict]):
-        # coin_list is [{'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin'}, ...]
-        self.coin_map = {
-            f"{c['symbol'].upper()} - {c['name']}": c 
-            for c in coin_list
-        }
-        self.completer = FuzzyCompleter(WordCompleter(list(self.coin_map.keys())))
+    def __init__(self, cache):
+        # cache is a CacheManager. Queries run on a worker thread: the
+        # connection lock may be held by a background save for a while.
+        self.cache = cache
+        self.completer = CoinCompleter(cache)
+        self.threaded_completer = ThreadedCompleter(self.completer)
         self.session = PromptSession()
 
     async def show(self) -> Optional[Dict]:
@@ -20,7 +35,11 @@ class SearchModal:
         """
         try:
             # Pause Rich live update before calling this
-            selected = await self.session.prompt_async("Search coin: ", completer=self.completer)
-            return self.coin_map.get(selected)
+            selected = await self.session.prompt_async("Search coin: ", completer=self.threaded_completer)
+            if selected in self.completer.seen:
+                return self.completer.seen[selected]
+            # Typed without picking a completion: take the best match
+            matches = await asyncio.to_thread(self.cache.search_coins, selected, limit=1)
+            return matches[0] if matches else None
         except (KeyboardInterrupt, EOFError):
             return None
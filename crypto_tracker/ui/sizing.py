@@ -0,0 +1,50 @@
+from typing import Callable, Optional
+from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
+import numpy as np
+import pandas as pd
+
+def downsample_ohlc(df: pd.DataFrame, buckets: int) -> pd.DataFrame:
+    """
+    Aggregates candles into `buckets` consecutive groups of near-equal size:
+    first open, max high, min low, last close, summed volume. Other columns
+    (time, indicators) keep the value at the edge of each bucket, so the
+    chart keeps every wick instead of skipping candles.
+    """
+    n = len(df)
+    if n <= buckets or buckets <= 0:
+        return df
+    starts = (np.arange(buckets) * n) // buckets
+    lasts = np.append(starts[1:], n) - 1
+
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == 'high':
+            out[col] = np.fmax.reduceat(values.astype(np.float64), starts)
+        elif col == 'low':
+            out[col] = np.fmin.reduceat(values.astype(np.float64), starts)
+        elif col == 'volume':
+            out[col] = np.add.reduceat(values.astype(np.float64), starts)
+        elif col in ('open', 'time', 'open_time'):
+            out[col] = values[starts]
+        else:
+            out[col] = values[lasts]
+    return pd.DataFrame(out)
+
+class SizedRenderable:
+    """
+    Defers rendering until Rich knows the region size: `render(width, height)`
+    is called with the space the parent (Layout / Panel) offers and the result
+    is reused while that size doesn't change.
+    """
+    def __init__(self, render: Callable[[int, Optional[int]], RenderableType]):
+        self.render = render
+        self._size = None
+        self._result = None
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        size = (options.max_width, options.height)
+        if size != self._size:
+            self._result = self.render(*size)
+            self._size = size
+        yield self._result
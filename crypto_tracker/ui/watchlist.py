@@ -1,8 +1,12 @@
 from rich.table import Table
-from typing import List, Dict
+from rich.markup import escape
+from typing import List, Dict, Optional, Tuple
+from crypto_tracker.utils.ticker_table import TickerTable
 
-def create_watchlist_table(coins_data: List[Dict]) -> Table:
-    table = Table(title="Watchlist", expand=True)
+def create_watchlist_table(coins_data: List[Dict], loading: bool = False,
+                           tickers: Optional[TickerTable] = None) -> Table:
+    """Rows listed on Binance take price and 24h change from the live `tickers`."""
+    table = Table(title="Watchlist (loading...)" if loading else "Watchlist", expand=True)
     table.add_column("Symbol", style="cyan")
     table.add_column("Price", style="white")
     table.add_column("24h%", style="green")
@@ -12,6 +16,10 @@ def create_watchlist_table(coins_data: List[Dict]) -> Table:
         price = coin.get('current_price') or 0
         change = coin.get('price_change_percentage_24h') or 0
         volume = coin.get('total_volume') or 0
+        live = tickers.get(coin.get('symbol', '').upper() + 'USDT') if tickers else None
+        if live:
+            price, change = live['price'], live['change']
+            volume = volume or live['quote_volume']
         
         color = "green" if change >= 0 else "red"
         
@@ -22,3 +30,27 @@ def create_watchlist_table(coins_data: List[Dict]) -> Table:
             f"${volume/1e9:.2f}B" if volume > 1e9 else f"${volume/1e6:.2f}M"
         )
     return table
+
+def create_screener_table(results: List[Dict], progress: Optional[Tuple[int, int]] = None,
+                          error: Optional[str] = None) -> Table:
+    title = "Screener"
+    if error:
+        title += f" [red](scan failed: {escape(error)})[/red]"
+    elif progress and progress[0] < progress[1]:
+        title += f" (scanning {progress[0]}/{progress[1]})"
+    table = Table(title=title, expand=True)
+    table.add_column("Symbol", style="cyan")
+    table.add_column("Price", style="white")
+    table.add_column("RSI", style="yellow")
+    table.add_column("Signals", style="magenta")
+
+    for row in results:
+        rsi = row.get('rsi')
+        rsi_text = f"{rsi:.0f}" if rsi == rsi else "-"  # NaN until enough history
+        table.add_row(
+            row['name'],
+            f"${row['current_price']:,.4g}",
+            rsi_text,
+            ", ".join(row['signals'])
+        )
+    return table
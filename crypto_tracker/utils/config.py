@@ -3,12 +3,79 @@ import os
 # Database
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'coins.db')
 FAVORITES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'favorites.json')
+DB_CACHE_KB = 16384       # SQLite page cache size
+DB_STATEMENT_CACHE = 256  # prepared statements kept per connection
+FTS_BULK_ROWS = 500       # save_coins changing this many rows rebuilds the search index once instead of per row
 
 # APIs
 COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
 BINANCE_API_URL = "https://api.binance.com/api/v3"
 BINANCE_WS_URL = "wss://stream.binance.com:9443/ws"
+BINANCE_WS_STREAM_URL = "wss://stream.binance.com:9443/stream"  # combined streams
+WS_MAX_STREAMS_PER_MESSAGE = 200    # streams per SUBSCRIBE / UNSUBSCRIBE message
+WS_QUEUE_SIZE = 1024                # max frames waiting to be handled; one per ticker stream (coalesced) plus closed candles
+WS_HEARTBEAT = 30                   # seconds between pings; no pong in time closes the connection
+WS_BACKOFF_BASE = 1                 # seconds before the first reconnect attempt
+WS_BACKOFF_MAX = 60                 # seconds between reconnects after repeated failures
+WS_BACKOFF_JITTER = 0.2             # +/- fraction applied to each reconnect delay
+WS_MAX_CONNECTION_AGE = 23.5 * 3600 # reconnect before Binance drops the connection at 24h
+
+# HTTP Client (shared, connection pooled)
+HTTP_MAX_CONNECTIONS = 100          # total pool size
+HTTP_MAX_PER_HOST = 10              # per-host connection limit
+HTTP_KEEPALIVE_TIMEOUT = 60         # seconds an idle connection stays open
+HTTP_DNS_CACHE_TTL = 300            # seconds
+HTTP_CONNECT_TIMEOUT = 5            # seconds (TCP + TLS)
+HTTP_READ_TIMEOUT = 10              # seconds between bytes
+HTTP_TOTAL_TIMEOUT = 20             # seconds per request
+
+# Rate limits
+BINANCE_WEIGHT_LIMIT = 6000         # request weight per minute (X-MBX-USED-WEIGHT-1M)
+BINANCE_WEIGHT_SAFETY = 0.8         # only spend this fraction of the limit
+COINGECKO_CALLS_PER_MIN = 20        # free tier budget
+COINGECKO_BURST = 4
+RATE_LIMIT_RETRIES = 3              # retries after a 429 before giving up
+RATE_LIMIT_MAX_BACKOFF = 60         # seconds
+
+# Response cache: endpoint -> (ttl, stale-while-revalidate window) in seconds
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+RESPONSE_TTLS = {
+    'binance:exchangeInfo': (3600, 86400),
+    'binance:klines': (2, 0),
+    'binance:ticker/24hr': (5, 10),
+    'coingecko:coins/list': (86400, 7 * 86400),
+    'coingecko:coins/markets': (30, 300),
+    'coingecko:search/trending': (300, 900),
+    'coingecko:coins/market_chart': (60, 300),
+}
+# Endpoints also persisted in the SQLite DB so they survive restarts
+RESPONSE_DISK_ENDPOINTS = {
+    'binance:exchangeInfo',
+    'coingecko:coins/markets',
+    'coingecko:search/trending',
+}
+
+# Klines
+KLINE_HISTORY = 300                 # candles loaded per chart (enough for SMA_200)
+KLINE_PAGE_LIMIT = 1000             # Binance max candles per request
+KLINE_CONCURRENCY = 8               # concurrent pages during range backfill
+
+# Screener
+SCREENER_INTERVAL = '1h'
+SCREENER_HISTORY = 99               # candles per pair (< 100 keeps each kline request at weight 1)
+SCREENER_CONCURRENCY = 16           # pairs fetched at once (the rate limiter still paces them)
+SCREENER_FRESH_OB = 5               # an order block set within this many candles counts as fresh
+SCREENER_RSI_OVERSOLD = 30
+SCREENER_RSI_OVERBOUGHT = 70
 
 # Settings
 REFRESH_RATE = 10  # seconds for watchlist
+REFRESH_JITTER = 0.2          # +/- fraction applied to each refresh delay
+REFRESH_MAX_BACKOFF = 300     # seconds between refreshes after repeated failures
+WATCHLIST_FULL_REFRESH = 120  # seconds between REST refreshes when the websocket covers every row
+MOVERS_COUNT = 15             # rows in the Gainers / Losers sidebar
+MOVERS_MIN_QUOTE_VOLUME = 1_000_000  # USDT traded in 24h; thinner pairs are left out of Gainers / Losers
+MOVERS_MIN_COVERAGE = 0.5     # share of USDT pairs streamed before Gainers / Losers stop using CoinGecko
+MAX_FPS = 30       # redraw cap; bursts of updates are painted at most this often
+POLL_INTERVAL = 0.1  # seconds between key polls where stdin can't be watched (Windows)
 CHART_HEIGHT = 20
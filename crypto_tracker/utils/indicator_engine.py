@@ -0,0 +1,268 @@
+import math
+from collections import deque
+from typing import Dict, List, Optional
+import pandas as pd
+from crypto_tracker.utils import config
+
+NAN = float('nan')
+
+# Same column names calculate_indicators() produces
+COLUMNS = (
+    'SMA_50', 'SMA_200', 'EMA_9', 'EMA_20',
+    'BBU_20_2.0', 'BBL_20_2.0',
+    'MACD_12_26_9', 'MACDs_12_26_9', 'MACDh_12_26_9',
+    'RSI_14',
+    'bullish_ob', 'bearish_ob',
+    'liq_short', 'liq_long',
+)
+
+# Each building block below keeps "committed" state for every candle except
+# the newest one. value(x) computes the newest (possibly still-open) candle
+# on top of that state without changing it, so revising the open candle is
+# just another value() call; commit(x) folds it in once a newer candle opens.
+
+class _RollingWindow:
+    """Rolling mean/std from running sums (shifted to limit cancellation)."""
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.shift = None
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self._pops = 0
+
+    def value(self, x: float):
+        n = len(self.values) + 1
+        if n < self.window:
+            return NAN, NAN
+        shift = self.shift if self.shift is not None else x
+        d = x - shift
+        total = self.sum + d
+        mean = shift + total / n
+        var = (self.sumsq + d * d - total * total / n) / (n - 1)
+        return mean, math.sqrt(var) if var > 0 else 0.0
+
+    def commit(self, x: float):
+        if self.shift is None:
+            self.shift = x
+        d = x - self.shift
+        self.values.append(d)
+        self.sum += d
+        self.sumsq += d * d
+        if len(self.values) > self.window - 1:
+            old = self.values.popleft()
+            self.sum -= old
+            self.sumsq -= old * old
+            self._pops += 1
+            if self._pops % 1024 == 0:  # shed accumulated rounding error
+                self.sum = math.fsum(self.values)
+                self.sumsq = math.fsum(v * v for v in self.values)
+
+class _Ema:
+    """EMA recurrence matching pandas ewm(adjust=False)."""
+    def __init__(self, span: int = None, alpha: float = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.y = None
+        self.count = 0
+
+    def value(self, x: float) -> float:
+        if self.y is None:
+            return x
+        return (1 - self.alpha) * self.y + self.alpha * x
+
+    def commit(self, x: float):
+        self.y = self.value(x)
+        self.count += 1
+
+class _RollingExtreme:
+    """Rolling max (or min) with a monotonic deque of (index, value)."""
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self.items = deque()
+        self.count = 0
+
+    def _better(self, a: float, b: float) -> bool:
+        return a >= b if self.is_max else a <= b
+
+    def value(self, x: float) -> float:
+        if self.count + 1 < self.window:
+            return NAN
+        if self.items and not self._better(x, self.items[0][1]):
+            return self.items[0][1]
+        return x
+
+    def commit(self, x: float):
+        index = self.count
+        while self.items and self._better(x, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((index, x))
+        # Keep what the next candle's window (index-window+2 .. index+1) still needs
+        while self.items[0][0] <= index - (self.window - 1):
+            self.items.popleft()
+        self.count += 1
+
+class _Rsi:
+    """Wilder RSI: EMA(alpha=1/period) of gains and losses, min_periods=period."""
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.gain = _Ema(alpha=1.0 / period)
+        self.loss = _Ema(alpha=1.0 / period)
+        self.prev_close = None
+
+    def _moves(self, x: float):
+        if self.prev_close is None:
+            return 0.0, 0.0
+        delta = x - self.prev_close
+        return (delta if delta > 0 else 0.0), (-delta if delta < 0 else 0.0)
+
+    def value(self, x: float) -> float:
+        if self.gain.count + 1 < self.period:
+            return NAN
+        gain, loss = self._moves(x)
+        avg_gain = self.gain.value(gain)
+        avg_loss = self.loss.value(loss)
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else NAN
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def commit(self, x: float):
+        gain, loss = self._moves(x)
+        self.gain.commit(gain)
+        self.loss.commit(loss)
+        self.prev_close = x
+
+class IndicatorEngine:
+    """
+    Incremental version of calculate_indicators(). Seed it with history, then
+    feed each new or revised candle; every indicator advances in O(1) and the
+    results match the batch path to floating-point tolerance. Only the newest
+    `max_rows` rows of output are kept; row indices count from the oldest kept.
+    """
+    def __init__(self, ob_lookback: int = 5, max_rows: int = config.KLINE_HISTORY):
+        self.ob_lookback = ob_lookback
+        self.max_rows = max(max_rows, 3) # order blocks rewrite the last three rows
+        self.sma_50 = _RollingWindow(50)
+        self.sma_200 = _RollingWindow(200)
+        self.bb = _RollingWindow(20)
+        self.ema_9 = _Ema(span=9)
+        self.ema_20 = _Ema(span=20)
+        self.ema_12 = _Ema(span=12)
+        self.ema_26 = _Ema(span=26)
+        self.macd_signal = _Ema(span=9)
+        self.rsi = _Rsi(14)
+        self.liq_short = _RollingExtreme(20, is_max=True)
+        self.liq_long = _RollingExtreme(20, is_max=False)
+
+        # Fixed-length deques drop the oldest row in O(1) once max_rows is reached
+        self.columns: Dict[str, deque] = {col: deque(maxlen=self.max_rows) for col in COLUMNS}
+        self.open_times: deque = deque(maxlen=self.max_rows)
+        self.count = 0                    # candles seen, including trimmed ones
+        self._tail = None                 # newest candle (open, high, low, close)
+        self._recent = deque(maxlen=3)    # last committed candles for order blocks
+        self._last_bull = NAN
+        self._last_bear = NAN
+
+    def __len__(self):
+        return len(self.open_times)
+
+    def seed(self, df: pd.DataFrame):
+        """Replays history. Uses the 'open_time' column when present, else row position."""
+        times = df['open_time'].tolist() if 'open_time' in df.columns else range(len(df))
+        for t, o, h, l, c in zip(times, df['open'].tolist(), df['high'].tolist(),
+                                 df['low'].tolist(), df['close'].tolist()):
+            self.update(t, o, h, l, c)
+        return self
+
+    def update(self, open_time: int, open_: float, high: float, low: float, close: float) -> Optional[int]:
+        """
+        Applies a candle. A repeated open_time revises the newest candle, a
+        later one appends. Returns the first row index whose values changed
+        (None if the candle was older than the newest one and ignored).
+        """
+        candle = (float(open_), float(high), float(low), float(close))
+        if self.open_times and open_time == self.open_times[-1]:
+            self._tail = candle
+            self._write_tail(len(self.open_times) - 1, replace=True)
+            return len(self.open_times) - 1
+        if self.open_times and open_time < self.open_times[-1]:
+            return None
+
+        if self._tail is not None:
+            self._commit(self._tail)
+        self._tail = candle
+        self.count += 1
+        self.open_times.append(open_time)
+        self._write_tail(len(self.open_times) - 1, replace=False)
+        return self._advance_order_blocks()
+
+    def _commit(self, candle):
+        o, h, l, c = candle
+        self.sma_50.commit(c)
+        self.sma_200.commit(c)
+        self.bb.commit(c)
+        macd = self.ema_12.value(c) - self.ema_26.value(c)
+        self.ema_9.commit(c)
+        self.ema_20.commit(c)
+        self.ema_12.commit(c)
+        self.ema_26.commit(c)
+        self.macd_signal.commit(macd)
+        self.rsi.commit(c)
+        self.liq_short.commit(h)
+        self.liq_long.commit(l)
+        self._recent.append(candle)
+
+    def _write_tail(self, row: int, replace: bool):
+        o, h, l, c = self._tail
+        mid, std = self.bb.value(c)
+        macd = self.ema_12.value(c) - self.ema_26.value(c)
+        signal = self.macd_signal.value(macd)
+        values = {
+            'SMA_50': self.sma_50.value(c)[0],
+            'SMA_200': self.sma_200.value(c)[0],
+            'EMA_9': self.ema_9.value(c),
+            'EMA_20': self.ema_20.value(c),
+            'BBU_20_2.0': mid + std * 2,
+            'BBL_20_2.0': mid - std * 2,
+            'MACD_12_26_9': macd,
+            'MACDs_12_26_9': signal,
+            'MACDh_12_26_9': macd - signal,
+            'RSI_14': self.rsi.value(c),
+            'liq_short': self.liq_short.value(h),
+            'liq_long': self.liq_long.value(l),
+        }
+        for col, value in values.items():
+            if replace:
+                self.columns[col][row] = value
+            else:
+                self.columns[col].append(value)
+        if not replace:
+            self.columns['bullish_ob'].append(self._last_bull)
+            self.columns['bearish_ob'].append(self._last_bear)
+
+    def _advance_order_blocks(self) -> int:
+        """Candle n-3 just became eligible; only the last three rows can change."""
+        n = len(self.open_times)
+        i = n - 3
+        if self.count - 3 < max(self.ob_lookback, 1) or len(self._recent) < 3:
+            return n - 1
+        po, ph, pl, pc = self._recent[-3]   # candle i-1
+        o, h, l, c = self._recent[-2]       # candle i
+        if c > o and (c - o) > (ph - pl) and pc < po:
+            self._last_bull = po
+        if c < o and (o - c) > (ph - pl) and pc > po:
+            self._last_bear = po
+        for row in range(i, n):
+            self.columns['bullish_ob'][row] = self._last_bull
+            self.columns['bearish_ob'][row] = self._last_bear
+        return i
+
+    def rows(self, start: int) -> Dict[str, List[float]]:
+        """Column values from row `start` to the newest candle."""
+        # Only the last few rows ever change, so index from the newest end
+        # instead of copying the whole deque
+        return {col: [values[i] for i in range(start - len(values), 0)]
+                for col, values in self.columns.items()}
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({col: list(values) for col, values in self.columns.items()})
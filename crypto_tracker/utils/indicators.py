@@ -1,95 +1,372 @@
 import pandas as pd
 import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple, Union, Callable
 
-def calculate_indicators(df: pd.DataFrame):
+# ---------------------------------------------------------------------------
+# Indicator registry
+#
+# Each indicator declares its default parameters and the columns it
+# publishes. Dependencies are resolved on demand: an indicator pulls raw
+# columns through IndicatorContext.column() and other indicators, with the
+# parameters it actually needs, through IndicatorContext.get(). get()
+# memoizes per parameter set, so shared intermediates (e.g. the 20-period SMA
+# behind Bollinger Bands) are computed once per call and only requested
+# indicators ever run.
+# ---------------------------------------------------------------------------
+
+class IndicatorSpec:
+    def __init__(self, name: str, func: Callable, params: Dict, outputs: Dict[str, str]):
+        self.name = name
+        self.func = func
+        self.params = params      # defaults
+        self.outputs = outputs    # result key -> column name template
+
+    def column_names(self, **params) -> Dict[str, str]:
+        full = {**self.params, **params}
+        return {key: template.format(**full) for key, template in self.outputs.items()}
+
+INDICATORS: Dict[str, IndicatorSpec] = {}
+
+def register(name: str, params: Optional[Dict] = None, outputs: Optional[Dict[str, str]] = None):
+    """
+    Decorator adding an indicator. The function receives the context plus its
+    parameters and returns a dict of Series keyed like `outputs`:
+
+        @register('sma', params={'period': 20}, outputs={'value': 'SMA_{period}'})
+        def sma(ctx, period):
+            return {'value': ctx.column('close').rolling(window=period).mean()}
+    """
+    def decorator(func):
+        INDICATORS[name] = IndicatorSpec(name, func, dict(params or {}), dict(outputs or {}))
+        return func
+    return decorator
+
+class IndicatorContext:
+    """Memoized inputs and intermediate results for one DataFrame."""
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._memo = {}
+
+    def column(self, name: str) -> pd.Series:
+        key = ('column', name)
+        if key not in self._memo:
+            self._memo[key] = pd.to_numeric(self.df[name])
+        return self._memo[key]
+
+    def get(self, name: str, **params) -> Dict[str, pd.Series]:
+        spec = INDICATORS[name]
+        full = {**spec.params, **params}
+        key = (name, tuple(sorted(full.items())))
+        if key not in self._memo:
+            self._memo[key] = spec.func(self, **full)
+        return self._memo[key]
+
+# UI toggles (CryptoTracker.active_indicators, 'liq_ob' for the levels
+# panel) -> the indicators they need.
+PRESETS: Dict[str, List[Tuple[str, Dict]]] = {
+    'sma': [('sma', {'period': 50}), ('sma', {'period': 200})],
+    'ema': [('ema', {'span': 9}), ('ema', {'span': 20})],
+    'bb': [('bb', {})],
+    'rsi': [('rsi', {})],
+    'macd': [('macd', {})],
+    'liq_ob': [('order_blocks', {}), ('liquidation', {})],
+}
+
+IndicatorRequest = Union[str, Tuple[str, Dict]]
+
+def resolve_requests(active: Iterable[IndicatorRequest]) -> List[Tuple[str, Dict]]:
+    """Expands preset names; (name, params) tuples pass through for custom periods."""
+    resolved = []
+    for item in active:
+        if isinstance(item, tuple):
+            resolved.append(item)
+        elif item in PRESETS:
+            resolved.extend(PRESETS[item])
+        elif item in INDICATORS:
+            resolved.append((item, {}))
+    return resolved
+
+def calculate_indicators(df: pd.DataFrame, active: Optional[Iterable[IndicatorRequest]] = None):
     """
     Adds technical indicators to the dataframe using pure pandas.
     Expected columns: 'open', 'high', 'low', 'close', 'volume'
+    `active` lists preset names ('sma', 'ema', 'bb', 'rsi', 'macd', 'liq_ob')
+    or (indicator, params) tuples; None computes every preset.
     """
     if df.empty:
         return df
 
-    # Ensure numeric types
-    close = pd.to_numeric(df['close'])
-    
-    # 1. Simple Moving Averages (SMA)
-    df['SMA_50'] = close.rolling(window=50).mean()
-    df['SMA_200'] = close.rolling(window=200).mean()
-    
-    # 2. Exponential Moving Average (EMA)
-    df['EMA_9'] = close.ewm(span=9, adjust=False).mean()
-    df['EMA_20'] = close.ewm(span=20, adjust=False).mean()
-    
-    # 3. Bollinger Bands (20, 2)
-    sma_20 = close.rolling(window=20).mean()
-    std_20 = close.rolling(window=20).std()
-    df['BBU_20_2.0'] = sma_20 + (std_20 * 2)
-    df['BBL_20_2.0'] = sma_20 - (std_20 * 2)
-    
-    # 4. MACD (12, 26, 9)
-    exp1 = close.ewm(span=12, adjust=False).mean()
-    exp2 = close.ewm(span=26, adjust=False).mean()
-    df['MACD_12_26_9'] = exp1 - exp2
-    df['MACDs_12_26_9'] = df['MACD_12_26_9'].ewm(span=9, adjust=False).mean() # Signal line
-    df['MACDh_12_26_9'] = df['MACD_12_26_9'] - df['MACDs_12_26_9'] # Histogram
-
-    # 5. RSI (14)
-    delta = close.diff()
+    requests = resolve_requests(PRESETS if active is None else active)
+    ctx = IndicatorContext(df)
+    for name, params in requests:
+        spec = INDICATORS[name]
+        result = ctx.get(name, **params)
+        for key, column in spec.column_names(**params).items():
+            df[column] = result[key]
+    return df
+
+# ---------------------------------------------------------------------------
+# Built-in indicators
+# ---------------------------------------------------------------------------
+
+@register('sma', params={'period': 20}, outputs={'value': 'SMA_{period}'})
+def _sma(ctx, period):
+    return {'value': ctx.column('close').rolling(window=period).mean()}
+
+@register('stdev', params={'period': 20})
+def _stdev(ctx, period):
+    return {'value': ctx.column('close').rolling(window=period).std()}
+
+@register('ema', params={'span': 9}, outputs={'value': 'EMA_{span}'})
+def _ema(ctx, span):
+    return {'value': ctx.column('close').ewm(span=span, adjust=False).mean()}
+
+@register('bb', params={'period': 20, 'mult': 2.0},
+          outputs={'upper': 'BBU_{period}_{mult}', 'lower': 'BBL_{period}_{mult}'})
+def _bollinger(ctx, period, mult):
+    mid = ctx.get('sma', period=period)['value']
+    std = ctx.get('stdev', period=period)['value']
+    return {'upper': mid + (std * mult), 'mid': mid, 'lower': mid - (std * mult)}
+
+@register('macd', params={'fast': 12, 'slow': 26, 'signal': 9},
+          outputs={'macd': 'MACD_{fast}_{slow}_{signal}', 'signal': 'MACDs_{fast}_{slow}_{signal}',
+                   'hist': 'MACDh_{fast}_{slow}_{signal}'})
+def _macd(ctx, fast, slow, signal):
+    macd = ctx.get('ema', span=fast)['value'] - ctx.get('ema', span=slow)['value']
+    signal_line = macd.ewm(span=signal, adjust=False).mean()
+    return {'macd': macd, 'signal': signal_line, 'hist': macd - signal_line}
+
+@register('rsi', params={'period': 14}, outputs={'value': 'RSI_{period}'})
+def _rsi(ctx, period):
+    delta = ctx.column('close').diff()
     gain = (delta.where(delta > 0, 0))
     loss = (-delta.where(delta < 0, 0))
     
     # Wilder's Smoothing
-    avg_gain = gain.ewm(alpha=1/14, min_periods=14, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1/14, min_periods=14, adjust=False).mean()
+    avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
     
     rs = avg_gain / avg_loss
-    df['RSI_14'] = 100 - (100 / (1 + rs))
-    
-    # 6. Advanced: Order Blocks and Liquidation
-    df = calculate_order_blocks(df)
-    df = calculate_liquidation_levels(df)
-    
-    return df
+    return {'value': 100 - (100 / (1 + rs))}
 
-def calculate_order_blocks(df: pd.DataFrame, lookback: int = 5) -> pd.DataFrame:
+@register('order_blocks', params={'lookback': 5},
+          outputs={'bullish': 'bullish_ob', 'bearish': 'bearish_ob'})
+def _order_blocks(ctx, lookback):
+    bullish, bearish = order_block_levels(
+        ctx.column('open').to_numpy(dtype=np.float64), ctx.column('high').to_numpy(dtype=np.float64),
+        ctx.column('low').to_numpy(dtype=np.float64), ctx.column('close').to_numpy(dtype=np.float64),
+        lookback
+    )
+    index = ctx.df.index
+    return {'bullish': pd.Series(bullish, index=index).ffill(),
+            'bearish': pd.Series(bearish, index=index).ffill()}
+
+@register('liquidation', params={'window': 20},
+          outputs={'short': 'liq_short', 'long': 'liq_long'})
+def _liquidation(ctx, window):
+    return {'short': ctx.column('high').rolling(window=window).max(),
+            'long': ctx.column('low').rolling(window=window).min()}
+
+def order_block_levels(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray,
+                       lookback: int = 5) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Identifies potential Order Blocks.
+    Identifies potential Order Blocks (before forward fill).
     Bullish OB: Last bearish candle before a strong bullish move that breaks structure.
     Bearish OB: Last bullish candle before a strong bearish move.
+    Vectorized over shifted arrays: candle i is compared with candle i-1.
+    Works on 1-D series or (n_symbols, n_candles) stacks.
     """
-    df['bullish_ob'] = np.nan
-    df['bearish_ob'] = np.nan
-    
-    # Simple algorithm for visualization purposes
-    for i in range(lookback, len(df) - 2):
-        # Bullish OB Detection
-        # 1. Current candle is Green, Strong move
-        if df['close'].iloc[i] > df['open'].iloc[i] and \
-           (df['close'].iloc[i] - df['open'].iloc[i]) > (df['high'].iloc[i-1] - df['low'].iloc[i-1]):
-            # 2. Previous candle was Red (The OB candidate)
-            if df['close'].iloc[i-1] < df['open'].iloc[i-1]:
-                 # Mark the open of the bearish candle as the OB level
-                 df.loc[df.index[i], 'bullish_ob'] = df['open'].iloc[i-1]
-
-        # Bearish OB Detection
-        # 1. Current candle is Red, Strong move
-        if df['close'].iloc[i] < df['open'].iloc[i] and \
-           (df['open'].iloc[i] - df['close'].iloc[i]) > (df['high'].iloc[i-1] - df['low'].iloc[i-1]):
-            # 2. Previous candle was Green
-            if df['close'].iloc[i-1] > df['open'].iloc[i-1]:
-                 # Mark the open of the bullish candle
-                 df.loc[df.index[i], 'bearish_ob'] = df['open'].iloc[i-1]
-                 
-    # Forward fill the last detected OB for visualization continuity (optional, but good for charts)
-    df['bullish_ob'] = df['bullish_ob'].ffill()
-    df['bearish_ob'] = df['bearish_ob'].ffill()
-    
+    n = c.shape[-1]
+    bullish = np.full(c.shape, np.nan)
+    bearish = np.full(c.shape, np.nan)
+
+    # Simple algorithm for visualization purposes (candles lookback .. n-3)
+    start = max(lookback, 1)
+    if n - 2 > start:
+        cur = (..., slice(start, n - 2))
+        prev = (..., slice(start - 1, n - 3))
+        body = c[cur] - o[cur]
+        prev_range = h[prev] - l[prev]
+        prev_body = c[prev] - o[prev]
+
+        # Green strong move after a red candle -> open of the red candle
+        bull = (body > 0) & (body > prev_range) & (prev_body < 0)
+        # Red strong move after a green candle -> open of the green candle
+        bear = (body < 0) & (-body > prev_range) & (prev_body > 0)
+
+        bullish[cur] = np.where(bull, o[prev], np.nan)
+        bearish[cur] = np.where(bear, o[prev], np.nan)
+    return bullish, bearish
+
+def calculate_order_blocks(df: pd.DataFrame, lookback: int = 5) -> pd.DataFrame:
+    """Adds forward-filled 'bullish_ob' / 'bearish_ob' columns."""
+    result = IndicatorContext(df).get('order_blocks', lookback=lookback)
+    df['bullish_ob'] = result['bullish']
+    df['bearish_ob'] = result['bearish']
     return df
 
 def calculate_liquidation_levels(df: pd.DataFrame, window: int = 20) -> pd.DataFrame:
     """
     Estimates Liquidation Levels based on Swing Highs/Lows.
     """
-    df['liq_short'] = df['high'].rolling(window=window).max()
-    df['liq_long'] = df['low'].rolling(window=window).min()
+    result = IndicatorContext(df).get('liquidation', window=window)
+    df['liq_short'] = result['short']
+    df['liq_long'] = result['long']
     return df
+
+# ---------------------------------------------------------------------------
+# Batched indicators over aligned (n_symbols, n_candles) arrays
+#
+# Histories shorter than n_candles are NaN front-padded (see stack_series);
+# every indicator treats a row as starting at its first valid close, so each
+# row matches calculate_indicators() on that symbol's own frame.
+# ---------------------------------------------------------------------------
+
+def stack_series(series: List[np.ndarray], length: Optional[int] = None) -> np.ndarray:
+    """Right-aligns 1-D arrays into an (n, length) float matrix, NaN front-padded."""
+    length = length if length is not None else max((len(s) for s in series), default=0)
+    out = np.full((len(series), length), np.nan)
+    for row, values in enumerate(series):
+        values = np.asarray(values, dtype=np.float64)[-length:] if length else ()
+        if len(values):
+            out[row, length - len(values):] = values
+    return out
+
+def _sliding(x: np.ndarray, window: int) -> np.ndarray:
+    """(n, m - window + 1, window) view; callers place the result at column window-1 onwards."""
+    return np.lib.stride_tricks.sliding_window_view(x, window, axis=-1)
+
+def _rolling_2d(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    # A window with any NaN is NaN, like pandas rolling(min_periods=window)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = reduce(_sliding(x, window), axis=-1)
+    return out
+
+def _rolling_mean_2d(x: np.ndarray, window: int) -> np.ndarray:
+    # Running sums over values shifted by each row's first valid close to
+    # limit cancellation; equal to pandas within floating-point tolerance.
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    valid = ~np.isnan(x)
+    first = np.where(valid.any(axis=-1), np.argmax(valid, axis=-1), 0)
+    shift = np.take_along_axis(x, first[:, None], axis=-1)
+    shifted = np.where(valid, x - shift, 0.0)
+    csum = np.cumsum(np.pad(shifted, ((0, 0), (1, 0))), axis=-1)
+    count = np.cumsum(np.pad(valid, ((0, 0), (1, 0))), axis=-1)
+    full = (count[:, window:] - count[:, :-window]) == window
+    sums = csum[:, window:] - csum[:, :-window]
+    out[:, window - 1:] = np.where(full, shift + sums / window, np.nan)
+    return out
+
+def _ema_2d(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """ewm(alpha, adjust=False) per row: starts at the first valid value, carries over NaNs."""
+    out = np.empty(x.shape)
+    y = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[-1]):
+        xt = x[:, t]
+        has = ~np.isnan(xt)
+        y = np.where(has, np.where(np.isnan(y), xt, (1 - alpha) * y + alpha * xt), y)
+        out[:, t] = y
+    if min_periods > 1:
+        out[np.cumsum(~np.isnan(x), axis=-1) < min_periods] = np.nan
+    return out
+
+def _ffill_2d(x: np.ndarray) -> np.ndarray:
+    idx = np.where(np.isnan(x), 0, np.arange(x.shape[-1]))
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return np.take_along_axis(x, idx, axis=-1)
+
+def _batch_sma(close, period):
+    return {'value': _rolling_mean_2d(close, period)}
+
+def _batch_ema(close, span):
+    return {'value': _ema_2d(close, 2.0 / (span + 1))}
+
+def _batch_bb(close, period, mult):
+    mid = _rolling_mean_2d(close, period)
+    std = _rolling_2d(close, period, lambda w, axis: np.std(w, axis=axis, ddof=1))
+    return {'upper': mid + (std * mult), 'lower': mid - (std * mult)}
+
+def _batch_macd(close, fast, slow, signal):
+    macd = _ema_2d(close, 2.0 / (fast + 1)) - _ema_2d(close, 2.0 / (slow + 1))
+    signal_line = _ema_2d(macd, 2.0 / (signal + 1))
+    return {'macd': macd, 'signal': signal_line, 'hist': macd - signal_line}
+
+def _batch_rsi(close, period):
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    started = ~np.isnan(close)
+    # The first valid candle has no move but still counts towards min_periods
+    gain = np.where(started, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(started, np.where(delta < 0, -delta, 0.0), np.nan)
+    avg_gain = _ema_2d(gain, 1 / period, min_periods=period)
+    avg_loss = _ema_2d(loss, 1 / period, min_periods=period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return {'value': 100 - (100 / (1 + rs))}
+
+def _batch_order_blocks(o, h, l, c, lookback):
+    # Each row is shifted left to its first valid candle so lookback counts
+    # from the symbol's own start, then shifted back into place.
+    offsets = np.isnan(c).sum(axis=-1)
+    if not offsets.any():
+        bullish, bearish = order_block_levels(o, h, l, c, lookback)
+        return {'bullish': _ffill_2d(bullish), 'bearish': _ffill_2d(bearish)}
+    n = c.shape[-1]
+    cols = (np.arange(n) + offsets[:, None]) % n
+    unpad = lambda x: np.take_along_axis(x, cols, axis=-1)
+    bullish, bearish = order_block_levels(unpad(o), unpad(h), unpad(l), unpad(c), lookback)
+    # Candles past each symbol's own n-3 (including the wrapped padding)
+    tail = np.arange(n) >= (n - offsets[:, None]) - 2
+    bullish[tail] = np.nan
+    bearish[tail] = np.nan
+    back = (np.arange(n) - offsets[:, None]) % n
+    padding = np.arange(n) < offsets[:, None]
+    result = {}
+    for key, levels in (('bullish', bullish), ('bearish', bearish)):
+        levels = np.take_along_axis(_ffill_2d(levels), back, axis=-1)
+        levels[padding] = np.nan
+        result[key] = levels
+    return result
+
+def _batch_liquidation(high, low, window):
+    return {'short': _rolling_2d(high, window, np.max),
+            'long': _rolling_2d(low, window, np.min)}
+
+_BATCH = {
+    'sma': (_batch_sma, ('close',)),
+    'ema': (_batch_ema, ('close',)),
+    'bb': (_batch_bb, ('close',)),
+    'macd': (_batch_macd, ('close',)),
+    'rsi': (_batch_rsi, ('close',)),
+    'order_blocks': (_batch_order_blocks, ('open', 'high', 'low', 'close')),
+    'liquidation': (_batch_liquidation, ('high', 'low')),
+}
+
+def calculate_indicators_batch(close: np.ndarray, high: Optional[np.ndarray] = None,
+                               low: Optional[np.ndarray] = None, open_: Optional[np.ndarray] = None,
+                               active: Optional[Iterable[IndicatorRequest]] = None) -> Dict[str, np.ndarray]:
+    """
+    calculate_indicators() for many symbols at once. Takes aligned
+    (n_symbols, n_candles) arrays and returns {column name: array of the same
+    shape}, using the same presets, custom (name, params) requests and column
+    names. high/low/open_ are only needed by 'liq_ob'.
+    """
+    inputs = {'close': np.atleast_2d(np.asarray(close, dtype=np.float64))}
+    for name, values in (('high', high), ('low', low), ('open', open_)):
+        if values is not None:
+            inputs[name] = np.atleast_2d(np.asarray(values, dtype=np.float64))
+
+    results = {}
+    for name, params in resolve_requests(PRESETS if active is None else active):
+        spec = INDICATORS[name]
+        func, needs = _BATCH[name]
+        missing = [col for col in needs if col not in inputs]
+        if missing:
+            raise ValueError(f"'{name}' needs {', '.join(missing)} arrays")
+        full = {**spec.params, **params}
+        result = func(*(inputs[col] for col in needs), **full)
+        for key, column in spec.column_names(**params).items():
+            results[column] = result[key]
+    return results
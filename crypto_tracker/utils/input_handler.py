@@ -15,6 +15,10 @@ class InputHandler:
             self.tty = tty
             self.termios = termios
             self.old_settings = None
+        # Event-loop delivery (see attach)
+        self.loop = None
+        self.on_key = None
+        self.reading = False
 
     def __enter__(self):
         if not self.is_windows:
@@ -24,9 +28,12 @@ class InputHandler:
             except Exception:
                 # Fallback for non-interactive or testing environments
                 pass
+        self._add_reader()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Release stdin so modals (input(), prompt_toolkit) can read it
+        self._remove_reader()
         if not self.is_windows and self.old_settings:
             self.termios.tcsetattr(sys.stdin, self.termios.TCSADRAIN, self.old_settings)
 
@@ -43,3 +50,43 @@ class InputHandler:
                 if self.select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], []):
                     return sys.stdin.read(1)
         return None
+
+    def attach(self, loop, on_key) -> bool:
+        """
+        Delivers key presses to on_key(key) from the event loop as soon as
+        stdin is readable. Returns False where that isn't possible (Windows
+        consoles), in which case the caller keeps polling get_key().
+        """
+        if self.is_windows:
+            return False
+        self.loop = loop
+        self.on_key = on_key
+        self._add_reader()
+        return True
+
+    def detach(self):
+        self._remove_reader()
+        self.loop = None
+        self.on_key = None
+
+    def _add_reader(self):
+        if self.loop and not self.reading:
+            self.loop.add_reader(sys.stdin.fileno(), self._on_readable)
+            self.reading = True
+
+    def _remove_reader(self):
+        if self.loop and self.reading:
+            self.loop.remove_reader(sys.stdin.fileno())
+            self.reading = False
+
+    def _on_readable(self):
+        # Raw read: sys.stdin's own buffer would hide pending bytes from the selector
+        try:
+            data = os.read(sys.stdin.fileno(), 1024)
+        except OSError:
+            data = b''
+        if not data: # EOF (stdin closed / not a terminal)
+            self._remove_reader()
+            return
+        for key in data.decode('utf-8', errors='ignore'):
+            self.on_key(key)
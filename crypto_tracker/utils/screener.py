@@ -0,0 +1,129 @@
+import asyncio
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from crypto_tracker.api.candles import CandleStore
+from crypto_tracker.api.scheduler import PRIORITY_PREFETCH
+from crypto_tracker.utils import config
+from crypto_tracker.utils.indicators import calculate_indicators_batch, stack_series
+
+# Indicator presets every scan computes
+SCAN_INDICATORS = ('rsi', 'bb', 'liq_ob')
+
+def _fresh(levels: np.ndarray, candles: int) -> np.ndarray:
+    """Rows whose forward-filled level was (re)set within the last `candles` candles."""
+    if levels.shape[-1] <= candles:
+        return ~np.isnan(levels[:, -1])
+    latest, before = levels[:, -1], levels[:, -candles - 1]
+    return ~np.isnan(latest) & ((latest != before) | np.isnan(before))
+
+# label -> (mask, strength) over the latest candle of every pair. Strength
+# (0..1) orders pairs that fire the same number of signals.
+Signal = Callable[[Dict[str, np.ndarray]], Tuple[np.ndarray, np.ndarray]]
+
+SIGNALS: Dict[str, Signal] = {
+    'Oversold': lambda m: (m['rsi'] < config.SCREENER_RSI_OVERSOLD,
+                           (config.SCREENER_RSI_OVERSOLD - m['rsi']) / config.SCREENER_RSI_OVERSOLD),
+    'Overbought': lambda m: (m['rsi'] > config.SCREENER_RSI_OVERBOUGHT,
+                             (m['rsi'] - config.SCREENER_RSI_OVERBOUGHT) / (100 - config.SCREENER_RSI_OVERBOUGHT)),
+    'Below BB': lambda m: (m['close'] < m['bb_lower'], (m['bb_lower'] - m['close']) / m['close']),
+    'Above BB': lambda m: (m['close'] > m['bb_upper'], (m['close'] - m['bb_upper']) / m['close']),
+    'Bull OB': lambda m: (_fresh(m['bullish_ob'], config.SCREENER_FRESH_OB), np.zeros(len(m['close']))),
+    'Bear OB': lambda m: (_fresh(m['bearish_ob'], config.SCREENER_FRESH_OB), np.zeros(len(m['close']))),
+}
+
+def rank_pairs(pairs: List[str], candles: Dict[str, np.ndarray],
+               signals: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Evaluates `signals` (default: all) on stacked (n_pairs, n_candles) OHLC
+    arrays and returns the pairs that fire at least one, strongest first.
+    """
+    if not pairs:
+        return []
+    close = candles['close']
+    ind = calculate_indicators_batch(close, candles['high'], candles['low'], candles['open'],
+                                     active=SCAN_INDICATORS)
+    latest = {
+        'close': close[:, -1],
+        'rsi': ind['RSI_14'][:, -1],
+        'bb_upper': ind['BBU_20_2.0'][:, -1],
+        'bb_lower': ind['BBL_20_2.0'][:, -1],
+        'bullish_ob': ind['bullish_ob'],
+        'bearish_ob': ind['bearish_ob'],
+    }
+    first = close[np.arange(len(pairs)), np.argmax(~np.isnan(close), axis=-1)]
+
+    names = list(signals or SIGNALS)
+    hits = np.zeros((len(names), len(pairs)), dtype=bool)
+    strength = np.zeros(len(pairs))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for row, name in enumerate(names):
+            mask, level = SIGNALS[name](latest)
+            hits[row] = mask
+            strength += np.where(mask, np.clip(np.nan_to_num(level), 0, 1), 0)
+        change = (latest['close'] - first) / first * 100
+    score = hits.sum(axis=0) + strength / max(len(names), 1)
+
+    results = []
+    for i in np.argsort(-score, kind='stable'):
+        if not hits[:, i].any():
+            break
+        pair = pairs[i]
+        base = pair[:-4] if pair.endswith('USDT') else pair
+        results.append({
+            'id': base.lower(),
+            'symbol': base.lower(),
+            'name': base,
+            'pair': pair,
+            'current_price': float(latest['close'][i]),
+            'change': float(np.nan_to_num(change[i])),
+            'rsi': float(latest['rsi'][i]),
+            'signals': [names[row] for row in np.flatnonzero(hits[:, i])],
+            'score': float(score[i]),
+        })
+    return results
+
+class Screener:
+    """
+    Scans many Binance pairs at once: candles come from the CandleStore
+    (so repeat scans only fetch the newest candles) at prefetch priority,
+    and indicators run as one vectorized batch over all pairs.
+    """
+    def __init__(self, candles: CandleStore, interval: str = config.SCREENER_INTERVAL,
+                 history: int = config.SCREENER_HISTORY,
+                 concurrency: int = config.SCREENER_CONCURRENCY,
+                 on_progress: Optional[Callable[[], None]] = None):
+        self.candles = candles
+        self.interval = interval
+        self.history = history
+        self.concurrency = concurrency
+        self.on_progress = on_progress # called after each pair loads
+        self.done = 0
+        self.total = 0
+
+    async def fetch(self, pairs: List[str]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Loads recent candles for every pair; pairs that fail or have no data are dropped."""
+        self.done, self.total = 0, len(pairs)
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def load(pair):
+            async with semaphore:
+                try:
+                    return await self.candles.get_recent(pair, self.interval, self.history,
+                                                         priority=PRIORITY_PREFETCH)
+                except Exception:
+                    return None
+                finally:
+                    self.done += 1
+                    if self.on_progress:
+                        self.on_progress()
+
+        loaded = await asyncio.gather(*(load(p) for p in pairs))
+        kept = [(p, k) for p, k in zip(pairs, loaded) if k is not None and len(k['close'])]
+        names = [p for p, _ in kept]
+        stacked = {col: stack_series([k[col][-self.history:] for _, k in kept], self.history)
+                   for col in ('open', 'high', 'low', 'close')}
+        return names, stacked
+
+    async def scan(self, pairs: List[str], signals: Optional[List[str]] = None) -> List[Dict]:
+        names, stacked = await self.fetch(pairs)
+        return rank_pairs(names, stacked, signals)
@@ -0,0 +1,91 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+class TickerTable:
+    """
+    Latest 24h ticker per Binance symbol, stored column-wise. `index` maps a
+    symbol to its slot, so applying a streamed ticker is a dict lookup and
+    three array stores, and whole-market reads run as NumPy over the first
+    `len(table)` slots. Slots stay dense: removing a symbol moves the last
+    slot into the hole.
+    """
+    def __init__(self, capacity: int = 64):
+        self.index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.price = np.zeros(capacity)
+        self.change = np.zeros(capacity)        # 24h change, percent
+        self.quote_volume = np.zeros(capacity)  # 24h volume in the quote asset (USDT)
+        self.version = 0                        # bumped on every change
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def _slot(self, symbol: str) -> int:
+        slot = self.index.get(symbol)
+        if slot is None:
+            slot = len(self.symbols)
+            if slot == len(self.price):
+                self.price, self.change, self.quote_volume = (
+                    np.resize(col, 2 * len(col)) for col in (self.price, self.change, self.quote_volume)
+                )
+            self.index[symbol] = slot
+            self.symbols.append(symbol)
+        return slot
+
+    def update(self, tickers: Iterable[Dict]):
+        """Applies websocket tickers (@ticker payloads or mini_to_ticker() rows)."""
+        for ticker in tickers:
+            slot = self._slot(ticker['s'])
+            self.price[slot] = float(ticker['c'])
+            self.change[slot] = float(ticker['P'])
+            self.quote_volume[slot] = float(ticker['q'])
+        self.version += 1
+
+    def get(self, symbol: str) -> Optional[Dict[str, float]]:
+        slot = self.index.get(symbol)
+        if slot is None:
+            return None
+        return {'price': float(self.price[slot]), 'change': float(self.change[slot]),
+                'quote_volume': float(self.quote_volume[slot])}
+
+    def price_of(self, symbol: str) -> Optional[float]:
+        slot = self.index.get(symbol)
+        return None if slot is None else float(self.price[slot])
+
+    def remove(self, symbol: str):
+        slot = self.index.pop(symbol, None)
+        if slot is None:
+            return
+        last = len(self.symbols) - 1
+        moved = self.symbols.pop()
+        if slot != last:
+            self.symbols[slot] = moved
+            self.index[moved] = slot
+            for col in (self.price, self.change, self.quote_volume):
+                col[slot] = col[last]
+        self.version += 1
+
+    def retain(self, symbols: Iterable[str]):
+        """Drops every symbol not in `symbols` (their streams were unsubscribed)."""
+        keep = set(symbols)
+        for symbol in [s for s in self.symbols if s not in keep]:
+            self.remove(symbol)
+
+    def top_movers(self, k: int, losers: bool = False, min_quote_volume: float = 0.0) -> List[str]:
+        """
+        The `k` symbols with the highest (or, for losers, lowest) 24h change
+        among those that traded at least `min_quote_volume`, best first.
+        argpartition selects them in O(n); only those k get sorted.
+        """
+        n = len(self.symbols)
+        candidates = np.flatnonzero(self.quote_volume[:n] >= min_quote_volume)
+        if k <= 0 or not len(candidates):
+            return []
+        key = self.change[candidates] if losers else -self.change[candidates]
+        if k < len(candidates):
+            part = np.argpartition(key, k - 1)[:k]
+            candidates, key = candidates[part], key[part]
+        return [self.symbols[i] for i in candidates[np.argsort(key, kind='stable')]]
@@ -1,56 +1,271 @@
-import threading
-import websocket
+import aiohttp
+import asyncio
+import itertools
 import json
-import time
-from typing import Callable, Dict
+import random
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from crypto_tracker.api.http_client import HttpClient, json_loads
+from crypto_tracker.utils import config
+
+# How a queued frame relates to the next one on the same stream
+SNAPSHOT = 'snapshot'   # full state: a newer frame replaces it
+MERGE = 'merge'         # partial state: a newer frame is folded into it (_merge)
+KEEP = 'keep'           # delivered as is, in order
 
 class WebSocketHandler:
-    def __init__(self, url: str, on_message: Callable[[Dict], None]):
+    """
+    Auto-reconnecting WebSocket on the shared aiohttp session, running on the
+    app's event loop. The reader only queues raw frames; a separate consumer
+    decodes them and calls `on_message`, in arrival order.
+
+    While a frame is still queued, the next one on the same stream is
+    coalesced into it (see _classify): a SNAPSHOT is replaced, a MERGE frame
+    has the newer one folded in, so a slow consumer skips stale state instead
+    of falling behind, and each such stream holds at most one queue slot.
+    KEEP frames (closed candles) queue in order. The queue never holds more
+    than `queue_size` frames: when full, a new SNAPSHOT or MERGE frame is
+    dropped, while a KEEP frame evicts the oldest coalescing frame, or
+    failing that the oldest KEEP frame.
+    """
+    def __init__(self, http: HttpClient, url: str, on_message: Callable[[Dict], None],
+                 queue_size: int = config.WS_QUEUE_SIZE):
+        self.http = http
         self.url = url
         self.on_message_callback = on_message
-        self.ws = None
-        self.thread = None
+        self.queue_size = queue_size
+        self.queue = deque()            # [frame, stream, kind] cells, oldest first
+        self.latest = {}                # stream -> its queued SNAPSHOT / MERGE cell
+        self.ready = asyncio.Event()
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
         self.running = False
+        self._tasks = []
+
+        # Counters
+        self.received = 0
+        self.coalesced = 0              # folded into a queued frame
+        self.dropped = 0                # discarded with the queue full
+        self.reconnects = 0
 
     def start(self):
         self.running = True
-        self.ws = websocket.WebSocketApp(
-            self.url,
-            on_message=self._on_message,
-            on_error=self._on_error,
-            on_close=self._on_close
-        )
-        self.thread = threading.Thread(target=self.ws.run_forever)
-        self.thread.daemon = True
-        self.thread.start()
-
-    def stop(self):
+        self._tasks = [asyncio.create_task(self._connect_forever()),
+                       asyncio.create_task(self._consume())]
+
+    async def stop(self):
         self.running = False
-        if self.ws:
-            self.ws.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, int]:
+        return {'received': self.received, 'coalesced': self.coalesced,
+                'dropped': self.dropped, 'reconnects': self.reconnects}
+
+    def _reconnect_delay(self, failures: int) -> float:
+        delay = min(config.WS_BACKOFF_BASE * (2 ** failures), config.WS_BACKOFF_MAX)
+        return delay * random.uniform(1 - config.WS_BACKOFF_JITTER, 1 + config.WS_BACKOFF_JITTER)
+
+    async def _connect_forever(self):
+        failures = 0
+        while self.running:
+            rolled_over = False
+            try:
+                session = (await self.http.start()).session
+                # heartbeat pings the server and closes the connection when no
+                # pong arrives; autoping answers the server's own pings
+                async with session.ws_connect(self.url, heartbeat=config.WS_HEARTBEAT,
+                                              autoping=True) as ws:
+                    self.ws = ws
+                    failures = 0
+                    await self._on_open()
+                    try:
+                        await asyncio.wait_for(self._read(ws), config.WS_MAX_CONNECTION_AGE)
+                    except asyncio.TimeoutError:
+                        rolled_over = True
+            except Exception:
+                failures += 1 # connect failed or the connection broke
+            finally:
+                self.ws = None
+                self._on_close()
+            if not self.running:
+                break
+            self.reconnects += 1
+            if not rolled_over:
+                await asyncio.sleep(self._reconnect_delay(max(failures - 1, 0)))
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse):
+        # Iteration ends on CLOSE / CLOSED
+        async for msg in ws:
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                self.received += 1
+                self._enqueue(msg.data)
+            elif msg.type == aiohttp.WSMsgType.ERROR:
+                break
+
+    def _classify(self, raw: str) -> Tuple[Optional[str], str]:
+        """(stream, SNAPSHOT / MERGE / KEEP) for a frame; stream is None for replies."""
+        return None, KEEP
+
+    def _merge(self, queued, raw: str):
+        """Folds a MERGE frame into the queued one; returns the combined frame."""
+        return raw
+
+    def _enqueue(self, raw: str):
+        stream, kind = self._classify(raw)
+        cell = self.latest.get(stream) if stream is not None else None
+        if cell is not None:
+            # Still waiting: fold the newer frame into its slot
+            if kind == MERGE:
+                cell[0] = self._merge(cell[0], raw)
+            else:
+                cell[0] = raw # a KEEP frame ends the stream's coalescing run
+                cell[2] = kind
+                if kind == KEEP:
+                    del self.latest[stream]
+            self.coalesced += 1
+            return
+        if len(self.queue) >= self.queue_size:
+            if kind != KEEP:
+                self.dropped += 1
+                return
+            self._evict()
+        cell = [raw, stream, kind]
+        self.queue.append(cell)
+        if kind != KEEP:
+            self.latest[stream] = cell
+        self.ready.set()
+
+    def _evict(self):
+        """Makes room for a KEEP frame in a full queue."""
+        index = next((i for i, cell in enumerate(self.queue) if cell[2] != KEEP), 0)
+        frame, stream, kind = self.queue[index]
+        del self.queue[index]
+        if kind != KEEP:
+            del self.latest[stream]
+        self.dropped += 1
 
-    def _on_message(self, ws, message):
-        if self.on_message_callback:
-            data = json.loads(message)
-            self.on_message_callback(data)
+    async def _consume(self):
+        while True:
+            if not self.queue:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+            cell = self.queue.popleft()
+            frame, stream, kind = cell
+            if kind != KEEP:
+                del self.latest[stream]
+            try:
+                # Merged frames are already decoded
+                self.on_message_callback(frame if isinstance(frame, dict) else json_loads(frame))
+            except Exception:
+                pass # one bad message shouldn't stop the stream
 
-    def _on_error(self, ws, error):
-        # In production, log this
+    async def _on_open(self):
         pass
 
-    def _on_close(self, ws, close_status_code, close_msg):
-        if self.running:
-            # Auto-reconnect
-            time.sleep(1)
-            self.start()
+    def _on_close(self):
+        pass
+
+def mini_to_ticker(mini: Dict) -> Dict:
+    """!miniTicker@arr entries lack the 24h change; derive it from the 24h open."""
+    open_price = float(mini['o'])
+    change = (float(mini['c']) - open_price) / open_price * 100 if open_price else 0.0
+    return dict(mini, P=change)
 
 class BinanceWebSocket(WebSocketHandler):
-    def __init__(self, on_ticker_update: Callable[[Dict], None]):
-        # Stream all tickers
-        url = "wss://stream.binance.com:9443/ws/!ticker@arr"
-        super().__init__(url, on_ticker_update)
-
-    def subscribe_kline(self, symbol: str, interval: str):
-        # If we needed specific subscriptions, we would send JSON payloads here.
-        # But for !ticker@arr it's a global stream.
-        pass
+    """
+    Combined-stream connection carrying only the streams in use. set_streams()
+    diffs the wanted set against what the connection has and sends the
+    difference as SUBSCRIBE / UNSUBSCRIBE; after a reconnect everything wanted
+    is subscribed again.
+    """
+    def __init__(self, http: HttpClient, on_ticker_update: Callable[[List[Dict]], None],
+                 on_kline_update: Optional[Callable[[Dict], None]] = None):
+        super().__init__(http, config.BINANCE_WS_STREAM_URL, self._dispatch)
+        self.on_ticker_update = on_ticker_update
+        self.on_kline_update = on_kline_update
+        self.streams = set()        # wanted
+        self.subscribed = set()     # sent on the current connection
+        self.connected = False
+        self.lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending = set()       # in-flight _sync() tasks
+
+    def set_streams(self, streams: Iterable[str]):
+        self.streams = set(streams)
+        if self.connected:
+            task = asyncio.create_task(self._sync())
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _sync(self):
+        async with self.lock:
+            if not self.connected:
+                return
+            remove = sorted(self.subscribed - self.streams)
+            add = sorted(self.streams - self.subscribed)
+            wanted = set(self.streams)
+            try:
+                if remove:
+                    await self._send('UNSUBSCRIBE', remove)
+                if add:
+                    await self._send('SUBSCRIBE', add)
+            except (aiohttp.ClientError, ConnectionError):
+                return # connection dropped; _on_open resubscribes
+            self.subscribed = wanted
+
+    async def _send(self, method: str, params: List[str]):
+        ws = self.ws
+        if ws is None or ws.closed:
+            raise ConnectionError("websocket is not connected")
+        step = config.WS_MAX_STREAMS_PER_MESSAGE
+        for i in range(0, len(params), step):
+            await ws.send_str(json.dumps({'method': method, 'params': params[i:i + step], 'id': next(self._ids)}))
+
+    async def _on_open(self):
+        self.connected = True
+        self.subscribed = set()
+        await self._sync()
+
+    def _on_close(self):
+        self.connected = False
+        self.subscribed = set()
+
+    async def stop(self):
+        for task in list(self._pending):
+            task.cancel()
+        await super().stop()
+
+    def _classify(self, raw: str) -> Tuple[Optional[str], str]:
+        # Combined-stream frames open with '{"stream":"<name>"'; acks don't
+        if not raw.startswith('{"stream":"'):
+            return None, KEEP
+        stream = raw[11:raw.find('"', 11)]
+        if stream.endswith('@arr'):
+            return stream, MERGE # only carries the symbols that changed
+        if '@kline_' in stream and '"x":true' in raw:
+            return stream, KEEP # closed candle; it gets committed and stored
+        return stream, SNAPSHOT
+
+    def _merge(self, queued, raw: str) -> Dict:
+        # !miniTicker@arr: newest entry per symbol
+        message = queued if isinstance(queued, dict) else json_loads(queued)
+        by_symbol = {ticker['s']: ticker for ticker in message['data']}
+        by_symbol.update((ticker['s'], ticker) for ticker in json_loads(raw)['data'])
+        message['data'] = list(by_symbol.values())
+        return message
+
+    def _dispatch(self, message: Dict):
+        stream = message.get('stream') if isinstance(message, dict) else None
+        if stream is None:
+            return # SUBSCRIBE / UNSUBSCRIBE acknowledgements
+        data = message['data']
+        if stream == '!miniTicker@arr':
+            self.on_ticker_update([mini_to_ticker(m) for m in data])
+        elif '@kline_' in stream:
+            if self.on_kline_update:
+                self.on_kline_update(data)
+        elif stream.endswith('@ticker'):
+            self.on_ticker_update([data])
@@ -1,6 +1,6 @@
 import pandas as pd
 import mplfinance as mpf
-from crypto_tracker.api.binance import BinanceAPI
+from crypto_tracker.api.binance import BinanceAPI, decode_klines, KLINE_COLUMNS
 import asyncio
 import os
 
@@ -16,17 +16,11 @@ async def generate_chart():
         return
 
     # 2. Process Data
-    df = pd.DataFrame(raw_data, columns=[
-        'timestamp', 'open', 'high', 'low', 'close', 'volume', 
-        'close_time', 'quote_asset_volume', 'trades', 
-        'taker_buy_base', 'taker_buy_quote', 'ignore'
-    ])
-    
-    for col in ['open', 'high', 'low', 'close', 'volume']:
-        df[col] = df[col].astype(float)
-        
-    df['Date'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df.set_index('Date', inplace=True)
+    klines = decode_klines(raw_data)
+    df = pd.DataFrame(
+        {col: klines[col] for col in KLINE_COLUMNS},
+        index=pd.DatetimeIndex(pd.to_datetime(klines['open_time'], unit='ms'), name='Date')
+    )
     
     # 3. Calculate Indicators
     df['MA20'] = df['close'].rolling(window=20).mean()
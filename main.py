@@ -1,6 +1,10 @@
 import asyncio
+import signal
 import sys
 import os
+import time
+import random
+from collections import deque
 
 # Set up path resolution
 SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -16,6 +20,7 @@ if not os.path.exists(PACKAGE_DIR):
 try:
     from rich.live import Live
     from rich.panel import Panel
+    from rich.markup import escape
     from rich.align import Align
     from rich.console import Console
     from rich.layout import Layout
@@ -26,13 +31,20 @@ except ImportError as e:
     pass 
 
 try:
-    from crypto_tracker.api.cache import CacheManager
+    from crypto_tracker.api.cache import CacheManager, AsyncCacheManager
     from crypto_tracker.api.coingecko import CoinGeckoAPI
-    from crypto_tracker.api.binance import BinanceAPI
+    from crypto_tracker.api.binance import BinanceAPI, klines_to_frame, ms_to_local_time
+    from crypto_tracker.api.http_client import HttpClient
+    from crypto_tracker.api.response_cache import ResponseCache
+    from crypto_tracker.api.candles import CandleStore
+    from crypto_tracker.api.scheduler import PRIORITY_SIDEBAR, PRIORITY_PREFETCH
     from crypto_tracker.utils.websocket_handler import BinanceWebSocket
     from crypto_tracker.utils import indicators
+    from crypto_tracker.utils.indicator_engine import IndicatorEngine
     from crypto_tracker.ui.search import SearchModal
-    from crypto_tracker.ui.watchlist import create_watchlist_table
+    from crypto_tracker.ui.watchlist import create_watchlist_table, create_screener_table
+    from crypto_tracker.utils.screener import Screener
+    from crypto_tracker.utils.ticker_table import TickerTable
     from crypto_tracker.ui.help import HelpModal
     from crypto_tracker.utils import config
     from crypto_tracker.utils.input_handler import InputHandler
@@ -41,18 +53,43 @@ except ImportError as e:
     print(f"Import Error: {e}")
     sys.exit(1)
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
 
 class CryptoTracker:
     def __init__(self):
         self.console = Console()
         self.cache = CacheManager()
+        self.db = AsyncCacheManager(self.cache) # Off-loop SQLite access
+        # Shared connection pool for all REST calls; responses cached in memory + DB
+        self.http = HttpClient(cache=ResponseCache(store=self.db))
+        self.candles = CandleStore(self.db, self.http) # Local OHLCV history
+        self.screener = Screener(self.candles, on_progress=self.request_redraw)
+        self.screener_task = None
+        self.screener_results = []
+        self.screener_error = None  # why the last scan failed, if it did
+        self.chart_task = None      # background loads (latest wins)
+        self.watchlist_task = None
+        self.chart_title = ""
+        self.chart_source = None    # (coin, timeframe) of the chart on screen
+        self.chart_error = None     # why the last chart load failed, if it did
+        self.chart_engine = None    # incremental indicators for the streamed chart
+        self.chart_stream = None    # (pair, interval) the engine follows
+        self.refresh_task = None    # periodic sidebar refresh
+        self.watchlist_refreshed = 0.0
+        self.tickers = TickerTable() # latest websocket ticker per Binance symbol
         self.layout = make_layout()
         self.plotext_renderer = PlotextChart()
         self.ascii_renderer = AsciiCandleChart()
         self.big_price_renderer = BigPriceRenderer()
         
+        # Bumped on every chart_data / watchlist_data assignment (see properties)
+        self.chart_version = 0
+        self.watchlist_version = 0
+        self._panel_keys = {} # layout region -> inputs it was last built from
+        self.ui_changed = True
+        self.big_price_layout = None
+
         self.current_coin = None 
         self.chart_data = pd.DataFrame()
         self.watchlist_data = []
@@ -79,18 +116,43 @@ class CryptoTracker:
         self.current_coin = {'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin', 'source': 'coingecko', 'rank': 1}
         
         self.binance_pairs = []
+        self.binance_pair_set = set()
         self.ws = None
+
+        # Event loop plumbing (set up in run())
+        self.loop = None
+        self.wake = None        # asyncio.Event: something needs a redraw
+        self.keys = deque()     # pending key presses
         
+    @property
+    def chart_data(self) -> pd.DataFrame:
+        return self._chart_data
+
+    @chart_data.setter
+    def chart_data(self, df: pd.DataFrame):
+        self._chart_data = df
+        self.chart_version += 1
+
+    @property
+    def watchlist_data(self) -> list:
+        return self._watchlist_data
+
+    @watchlist_data.setter
+    def watchlist_data(self, rows: list):
+        self._watchlist_data = rows
+        self.watchlist_version += 1
+
     async def initialize(self):
         """Load initial data"""
         self.console.print("[yellow]Initializing... Fetching coin list...[/yellow]")
+        await self.http.start()
         
         # 1. Load all coins if cache empty
-        if self.cache.is_cache_empty():
-            async with CoinGeckoAPI() as cg:
+        if await self.db.is_cache_empty():
+            async with CoinGeckoAPI(self.http) as cg:
                 try:
                     coins = await cg.get_coin_list()
-                    self.cache.save_coins(coins)
+                    await self.db.save_coins(coins)
                     self.console.print(f"[green]Loaded {len(coins)} coins into cache.[/green]")
                     
                     # Fetch top 250 coins metadata
@@ -106,34 +168,148 @@ class CryptoTracker:
                             'rank': c['market_cap_rank'],
                             'source': 'coingecko'
                         })
-                    self.cache.save_coins(coins_update)
+                    await self.db.save_coins(coins_update)
                     
                 except Exception as e:
                     self.console.print(f"[red]Failed to load coins: {e}[/red]")
         
         # 2. Get Binance Pairs
         try:
-            async with BinanceAPI() as bn:
+            async with BinanceAPI(self.http) as bn:
                 pairs = await bn.get_exchange_info()
                 self.binance_pairs = [p['symbol'] for p in pairs]
+                self.binance_pair_set = set(self.binance_pairs)
         except Exception as e:
              self.console.print(f"[red]Failed to load binance pairs: {e}[/red]")
 
         # 3. Start WebSocket
-        self.ws = BinanceWebSocket(self.on_ticker_update)
+        self.ws = BinanceWebSocket(self.http, self.on_ticker_update, self.on_kline_update)
         self.ws.start()
+        self.sync_streams()
 
         # 4. Initial Data Load
-        await self.update_current_coin_data()
+        await self._run_load(self.update_current_coin_data, self.chart_load_failed)
         await self.update_watchlist()
 
-    def on_ticker_update(self, data):
-        if not self.current_coin:
+    def wanted_streams(self) -> set:
+        """Websocket streams the current view needs: coin ticker + kline, sidebar tickers."""
+        streams = set()
+        pair = self.current_coin['symbol'].upper() + "USDT"
+        if pair in self.binance_pair_set:
+            interval = self.get_interval_params()[0]
+            streams.add(f"{pair.lower()}@ticker")
+            streams.add(f"{pair.lower()}@kline_{interval}")
+        if self.sidebar_mode in ['Gainers', 'Losers']:
+            streams.add('!miniTicker@arr')
+        elif self.sidebar_mode != 'Screener':
+            for row in self.watchlist_data:
+                pair = row.get('symbol', '').upper() + "USDT"
+                if pair in self.binance_pair_set:
+                    streams.add(f"{pair.lower()}@ticker")
+        return streams
+
+    def sync_streams(self):
+        """Subscribes / unsubscribes the difference; cheap when nothing changed."""
+        if not self.ws:
             return
+        streams = self.wanted_streams()
+        if streams == self.ws.streams:
+            return
+        self.ws.set_streams(streams)
+        # Tickers of dropped symbols would go stale
+        if '!miniTicker@arr' not in streams:
+            self.tickers.retain(s.split('@')[0].upper() for s in streams)
+
+    def on_ticker_update(self, data):
+        if self.binance_pair_set:
+            # !miniTicker@arr covers every quote asset; keep the USDT pairs
+            data = [t for t in data if t['s'] in self.binance_pair_set]
+        # Only subscribed (visible) symbols arrive, so every update redraws
+        self.tickers.update(data)
+        if self.current_coin:
+            price = self.tickers.price_of(self.current_coin['symbol'].upper() + "USDT")
+            if price is not None:
+                self.live_price = price
+        if self.sidebar_mode in ['Gainers', 'Losers'] and not self.watchlist_loading:
+            rows = self.live_movers(self.sidebar_mode)
+            if rows is not None:
+                self.watchlist_data = rows
+        self.request_redraw()
+
+    def movers_live(self) -> bool:
+        """True once !miniTicker@arr has filled the ticker table with most USDT pairs."""
+        return bool(self.binance_pair_set) and \
+            len(self.tickers) >= config.MOVERS_MIN_COVERAGE * len(self.binance_pair_set)
+
+    def live_movers(self, mode: str):
+        """
+        Gainers / Losers rows over every streamed USDT pair (None until the
+        table covers enough of the market to be trusted over CoinGecko).
+        """
+        if not self.movers_live():
+            return None
+        rows = []
+        for pair in self.tickers.top_movers(config.MOVERS_COUNT, losers=(mode == 'Losers'),
+                                            min_quote_volume=config.MOVERS_MIN_QUOTE_VOLUME):
+            ticker = self.tickers.get(pair)
+            base = pair[:-4]
+            rows.append({
+                'id': base.lower(),
+                'symbol': base.lower(),
+                'name': base,
+                'pair': pair,
+                'current_price': ticker['price'],
+                'price_change_percentage_24h': ticker['change'],
+                'total_volume': ticker['quote_volume'],
+            })
+        return rows
+
+    def on_kline_update(self, data):
         symbol = self.current_coin['symbol'].upper() + "USDT"
-        target_ticker = next((x for x in data if x['s'] == symbol), None)
-        if target_ticker:
-            self.live_price = float(target_ticker['c'])
+        if data.get('s') != symbol:
+            return
+        k = data['k']
+        row = (int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']))
+        self.http.spawn(self.candles.ingest(symbol, k['i'], row, bool(k['x'])))
+        # The open candle's close is the freshest price
+        self.live_price = row[4]
+        if self.chart_stream == (symbol, k['i']):
+            self.update_live_candle(row)
+        self.request_redraw()
+
+    def update_live_candle(self, row):
+        """
+        Applies a streamed (open_time, o, h, l, c, v) candle to chart_data: the
+        open candle is revised in place, a newer one is appended and the oldest
+        dropped so the window keeps its size. Only the indicator rows the
+        engine reports as changed are rewritten.
+        """
+        df = self.chart_data
+        open_time, o, h, l, c, v = row
+        start = self.chart_engine.update(open_time, o, h, l, c)
+        if start is None:
+            return # older than the newest candle
+        updates = {}
+        if open_time == df['open_time'].iat[-1]:
+            updates = {'open': [o], 'high': [h], 'low': [l], 'close': [c], 'volume': [v]}
+        else:
+            candle = pd.DataFrame({'time': ms_to_local_time([open_time]), 'open': [o], 'high': [h],
+                                   'low': [l], 'close': [c], 'volume': [v], 'open_time': [open_time]})
+            df = pd.concat([df.iloc[1:], candle], ignore_index=True)
+
+        changed = self.chart_engine.rows(start)
+        updates.update((col, changed[col]) for col in df.columns if col in changed)
+        # Scalar writes: far cheaper than a block .iloc assignment for a few cells
+        for col, values in updates.items():
+            j = df.columns.get_loc(col)
+            first = len(df) - len(values)
+            for offset, value in enumerate(values):
+                df.iat[first + offset, j] = value
+
+        if df is self.chart_data:
+            self.chart_version += 1 # mutated in place; the setter didn't run
+        else:
+            self.chart_data = df
 
     def get_interval_params(self):
         mapping = {
@@ -155,193 +331,400 @@ class CryptoTracker:
         
         return mapping.get(self.timeframe.lower(), ('1h', '1'))
 
+    def load_chart(self):
+        """Loads the chart in the background; a newer request cancels a stale one."""
+        self.chart_error = None
+        self.chart_task = self.restart_task(self.chart_task, self.update_current_coin_data,
+                                            self.chart_load_failed)
+
+    def load_watchlist(self):
+        """Refreshes the sidebar in the background, newest request wins."""
+        self.watchlist_task = self.restart_task(self.watchlist_task, self.update_watchlist)
+
+    def restart_task(self, task, load, on_error=None):
+        if task and not task.done():
+            task.cancel()
+        task = asyncio.create_task(self._run_load(load, on_error))
+        self.request_redraw() # show the loading indicator
+        return task
+
+    async def _run_load(self, load, on_error=None):
+        try:
+            await load()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The previous data stays on screen
+            if on_error:
+                on_error(e)
+        finally:
+            self.request_redraw()
+
+    def chart_load_failed(self, error):
+        """Puts coin/timeframe back to what the chart on screen shows and keeps the reason."""
+        failed = f"{self.current_coin['symbol'].upper()} {self.timeframe.upper()}"
+        if self.chart_source:
+            coin, self.timeframe = self.chart_source
+            self.current_coin = dict(coin)
+            self.live_price = self.chart_data.iloc[-1]['close']
+        self.chart_error = f"{failed}: {str(error) or type(error).__name__}"
+
+    @property
+    def chart_loading(self) -> bool:
+        return bool(self.chart_task and not self.chart_task.done())
+
+    @property
+    def watchlist_loading(self) -> bool:
+        return bool(self.watchlist_task and not self.watchlist_task.done())
+
     async def update_current_coin_data(self):
+        coin, timeframe = dict(self.current_coin), self.timeframe
         symbol = self.current_coin['symbol'].upper() + "USDT"
+        title = f"{self.current_coin['symbol'].upper()}/USDT {self.timeframe.upper()}"
         df = pd.DataFrame()
         binance_interval, cg_days = self.get_interval_params()
 
         if symbol in self.binance_pairs:
-            async with BinanceAPI() as bn:
-                klines = await bn.get_klines(symbol, interval=binance_interval)
-                if klines:
-                    data = []
-                    for k in klines:
-                        data.append({
-                            'time': datetime.fromtimestamp(k[0]/1000),
-                            'open': float(k[1]),
-                            'high': float(k[2]),
-                            'low': float(k[3]),
-                            'close': float(k[4]),
-                            'volume': float(k[5])
-                        })
-                    df = pd.DataFrame(data)
+            # Local history + only the missing candles from Binance
+            klines = await self.candles.get_recent(symbol, binance_interval, config.KLINE_HISTORY)
+            if len(klines['open_time']):
+                df = klines_to_frame(klines)
         else:
-            async with CoinGeckoAPI() as cg:
+            async with CoinGeckoAPI(self.http) as cg:
                 data = await cg.get_coin_market_chart(self.current_coin['id'], days=cg_days)
                 prices = data.get('prices', [])
                 if prices:
-                    ohlc_data = []
-                    for p in prices:
-                        ohlc_data.append({
-                            'time': datetime.fromtimestamp(p[0]/1000),
-                            'open': p[1], 'high': p[1], 'low': p[1], 'close': p[1], 'volume': 0
-                        })
-                    df = pd.DataFrame(ohlc_data)
+                    # Line data only: every OHLC field is the sampled price
+                    points = np.asarray(prices, dtype=np.float64)
+                    close = points[:, 1]
+                    df = pd.DataFrame({
+                        'time': ms_to_local_time(points[:, 0].astype(np.int64)),
+                        'open': close, 'high': close, 'low': close, 'close': close,
+                        'volume': np.zeros(len(close))
+                    })
 
-        if not df.empty:
-            if len(df) > 50:
-                df = indicators.calculate_indicators(df)
-            self.chart_data = df
-            self.live_price = df.iloc[-1]['close']
+        engine = None
+        if 'open_time' in df.columns:
+            # Streamed klines then only recompute the indicator tail
+            engine = IndicatorEngine(max_rows=len(df)).seed(df) # same window as chart_data
+
+        if df.empty:
+            raise LookupError("no chart data")
+
+        df = self.apply_indicators(df)
+        self.chart_title = title # labels the data actually shown
+        self.chart_source = (coin, timeframe)
+        self.chart_engine = engine
+        self.chart_stream = (symbol, binance_interval) if engine else None
+        self.chart_data = df
+        self.live_price = df.iloc[-1]['close']
+
+    def required_indicators(self):
+        """Indicator presets the current view actually draws."""
+        required = set(self.active_indicators)
+        if self.show_liquidation_ob:
+            required.add('liq_ob')
+        return required
+
+    def apply_indicators(self, df):
+        """Recomputes indicator columns for the active set on top of the raw candles."""
+        base = [col for col in ('time', 'open', 'high', 'low', 'close', 'volume', 'open_time') if col in df.columns]
+        df = df[base].copy()
+        if len(df) > 50:
+            df = indicators.calculate_indicators(df, self.required_indicators())
+        return df
 
     async def update_watchlist(self):
-        async with CoinGeckoAPI() as cg:
-            if self.sidebar_mode == 'Top':
-                self.watchlist_data = await cg.get_top_coins(limit=15)
-            elif self.sidebar_mode == 'Trending':
-                self.watchlist_data = await cg.get_trending()
-            elif self.sidebar_mode == 'Favorites':
-                fav_ids = self.cache.get_favorites()
+        if self.sidebar_mode == 'Screener':
+            self.start_screener()
+            return
+        self.watchlist_data = await self.fetch_watchlist(self.sidebar_mode)
+        self.watchlist_refreshed = time.monotonic()
+
+    async def fetch_watchlist(self, mode: str, priority: int = PRIORITY_SIDEBAR) -> list:
+        """Rows for a sidebar mode (CoinGecko markets format)."""
+        async with CoinGeckoAPI(self.http) as cg:
+            if mode == 'Top':
+                return await cg.get_top_coins(limit=15, priority=priority)
+            elif mode == 'Trending':
+                return await cg.get_trending(priority=priority)
+            elif mode == 'Favorites':
+                fav_ids = await self.db.get_favorites()
                 if fav_ids:
-                    self.watchlist_data = await cg.get_coins_by_ids(fav_ids)
-                else:
-                    self.watchlist_data = []
-            elif self.sidebar_mode in ['Gainers', 'Losers']:
-                gl = await cg.get_gainers_losers()
-                if self.sidebar_mode == 'Gainers':
-                    self.watchlist_data = gl['gainers']
+                    return await cg.get_coins_by_ids(fav_ids, priority=priority)
+                return []
+            elif mode in ['Gainers', 'Losers']:
+                rows = self.live_movers(mode)
+                if rows is not None:
+                    return rows
+                # Not streaming yet: CoinGecko's top 250 by market cap
+                gl = await cg.get_gainers_losers(priority=priority)
+                if mode == 'Gainers':
+                    return gl['gainers']
+                return gl['losers']
+        return []
+
+    def uncovered_rows(self, rows: list) -> list:
+        """Rows the ticker table has no live price for (not on Binance, or not streamed yet)."""
+        return [row for row in rows if row.get('symbol', '').upper() + 'USDT' not in self.tickers]
+
+    async def refresh_uncovered(self, mode: str, rows: list, uncovered: list) -> list:
+        """
+        `rows` with only the uncovered ones re-fetched from CoinGecko (by id);
+        rows the websocket keeps live are left as they are. Favorites also
+        pick up coins added or removed since the last fetch. Empty if the
+        request came back with nothing.
+        """
+        ids = [row['id'] for row in uncovered]
+        if mode == 'Favorites':
+            favorites = await self.db.get_favorites()
+            shown = {row['id'] for row in rows}
+            ids += [i for i in favorites if i not in shown]
+            rows = [row for row in rows if row['id'] in set(favorites)]
+        if not ids:
+            return rows
+        async with CoinGeckoAPI(self.http) as cg:
+            fresh = {row['id']: row for row in await cg.get_coins_by_ids(ids, priority=PRIORITY_PREFETCH)}
+        if not fresh:
+            return []
+        merged = [fresh.pop(row['id'], row) for row in rows]
+        return merged + list(fresh.values())
+
+    async def refresh_watchlist_periodically(self):
+        """
+        Keeps the sidebar current every REFRESH_RATE seconds (with jitter).
+        Rows the ticker table covers are already live and need no REST; the
+        others are re-fetched by id. The full list (membership, volume) is
+        refetched every WATCHLIST_FULL_REFRESH.
+        Failures back off exponentially. Paused while the sidebar is hidden.
+        """
+        failures = 0
+        while self.is_running:
+            delay = min(config.REFRESH_RATE * (2 ** failures), config.REFRESH_MAX_BACKOFF)
+            await asyncio.sleep(delay * random.uniform(1 - config.REFRESH_JITTER, 1 + config.REFRESH_JITTER))
+
+            mode = self.sidebar_mode
+            if self.view_mode == 'big_price' or mode == 'Screener' or self.watchlist_loading:
+                continue
+            if mode in ['Gainers', 'Losers'] and self.movers_live():
+                continue # on_ticker_update keeps the list current
+
+            rows = self.watchlist_data
+            uncovered = self.uncovered_rows(rows)
+            full_refresh = time.monotonic() - self.watchlist_refreshed >= config.WATCHLIST_FULL_REFRESH
+            if rows and not uncovered and not full_refresh and mode != 'Favorites':
+                continue # Favorites still checks membership (a local read)
+
+            try:
+                if full_refresh or not rows:
+                    fresh = await self.fetch_watchlist(mode, PRIORITY_PREFETCH)
                 else:
-                    self.watchlist_data = gl['losers']
+                    fresh = await self.refresh_uncovered(mode, rows, uncovered)
+            except Exception:
+                fresh = []
+            if not fresh and self.watchlist_data:
+                # API errors come back as empty lists; keep the old rows
+                failures = min(failures + 1, 10)
+                continue
+            failures = 0
+            # The user may have switched modes meanwhile
+            if mode == self.sidebar_mode and not self.watchlist_loading:
+                self.watchlist_data = fresh
+                if full_refresh or not rows:
+                    self.watchlist_refreshed = time.monotonic()
+                self.request_redraw()
+
+    def start_screener(self):
+        """Scans every Binance USDT pair in the background; the sidebar shows progress."""
+        self.watchlist_data = self.screener_results # last scan until the new one lands
+        if self.screener_task and not self.screener_task.done():
+            return
+        self.screener_task = asyncio.create_task(self._run_screener())
+
+    async def _run_screener(self):
+        self.screener_error = None
+        try:
+            self.screener_results = await self.screener.scan(self.binance_pairs)
+        except Exception as e:
+            # The previous results stay up, marked as stale
+            self.screener_error = str(e) or type(e).__name__
+            self.request_redraw()
+            return
+        if self.sidebar_mode == 'Screener':
+            self.watchlist_data = self.screener_results
+            self.request_redraw()
+
+    async def coin_for_symbol(self, symbol: str):
+        """Best cached coin for a bare ticker symbol (screener rows only carry the pair)."""
+        for coin in await self.db.search_coins(symbol, limit=5):
+            if coin['symbol'].lower() == symbol.lower():
+                return coin
+        return None
+
+    def update_panel(self, name: str, key, build):
+        """Rebuilds a layout region only when its inputs (`key`) changed."""
+        if self._panel_keys.get(name) == key:
+            return
+        self._panel_keys[name] = key
+        self.layout[name].update(build())
+        self.ui_changed = True
+
+    def update_levels(self, key, enabled: bool):
+        """Model Key Levels panel below the chart; collapsed when empty or disabled."""
+        key = key + (enabled,)
+        if self._panel_keys.get("levels") == key:
+            return
+        self._panel_keys["levels"] = key
+        panel = self.ascii_renderer.render_levels_panel(
+            self.chart_data,
+            self.show_liquidation_ob
+        ) if enabled else None
+        self.layout["levels"].update(panel or Panel(""))
+        self.layout["levels"].size = self.levels_height if panel else 0
+        self.ui_changed = True
+
+    def price_change(self) -> float:
+        """Live price vs. the open of the newest candle, in percent."""
+        price = self.live_price or 0
+        if not self.chart_data.empty:
+            open_price = self.chart_data['open'].iloc[-1]
+            if open_price > 0:
+                return ((price - open_price) / open_price) * 100
+        return 0
 
     def render_ui(self) -> Layout:
+        """
+        Brings the layout up to date, rebuilding only panels whose inputs
+        changed; `ui_changed` tells the caller whether a redraw is needed.
+        """
+        self.ui_changed = False
+        size = tuple(self.console.size)
+
         # Handle Big Price Mode
         if self.view_mode == 'big_price':
-            price = self.live_price or 0
-            # Calculate change if data exists
-            change = 0
-            if not self.chart_data.empty:
-                open_price = self.chart_data['open'].iloc[-1]
-                if open_price > 0:
-                    change = ((price - open_price) / open_price) * 100
-            
-            layout = Layout()
-            layout.update(self.big_price_renderer.render(
-                self.current_coin['symbol'],
-                price,
-                change
-            ))
-            return layout
+            key = ('big_price', self.current_coin['symbol'], self.live_price, self.chart_version, size)
+            if self._panel_keys.get('big_price') != key:
+                self._panel_keys = {'big_price': key} # standard panels rebuild on return
+                self.big_price_layout = Layout()
+                self.big_price_layout.update(self.big_price_renderer.render(
+                    self.current_coin['symbol'],
+                    self.live_price or 0,
+                    self.price_change()
+                ))
+                self.ui_changed = True
+            return self.big_price_layout
+        self._panel_keys.pop('big_price', None)
 
         # Header
-        title_str = f"🪙 UNIVERSAL CRYPTO TRACKER v3.0 | {self.current_coin['name']} ({self.current_coin['symbol'].upper()})"
-        if self.live_price:
-             title_str += f" | ${self.live_price:,.2f}"
-        
-        self.layout["header"].update(Panel(
-            Align.center(title_str),
-            style="bold white on blue"
-        ))
+        def build_header():
+            title_str = f"🪙 UNIVERSAL CRYPTO TRACKER v3.0 | {self.current_coin['name']} ({self.current_coin['symbol'].upper()})"
+            if self.live_price:
+                 title_str += f" | ${self.live_price:,.2f}"
+            return Panel(
+                Align.center(title_str),
+                style="bold white on blue"
+            )
+        self.update_panel("header", (self.current_coin['name'], self.current_coin['symbol'], self.live_price), build_header)
 
         # Chart
+        chart_key = (self.chart_version, self.show_chart, self.chart_type, self.chart_loading, self.chart_error,
+                     frozenset(self.active_indicators), self.show_liquidation_ob, self.levels_height)
         if self.show_chart and not self.chart_data.empty:
-            title = f"{self.current_coin['symbol'].upper()}/USDT {self.timeframe.upper()}"
+            title = self.chart_title
+            if self.chart_loading:
+                subtitle = "[yellow]Loading...[/yellow]"
+            elif self.chart_error:
+                subtitle = f"[red]Couldn't load {escape(self.chart_error)}[/red]"
+            else:
+                subtitle = None
             
             if self.chart_type == 'ascii':
                 # Pass specific flags to ASCII renderer
-                # Render Chart
-                chart_str = self.ascii_renderer.render(
+                # Render Chart (sized to the panel when drawn)
+                self.update_panel("chart", chart_key, lambda: Panel(self.ascii_renderer.sized(
                     self.chart_data, 
                     title, 
                     active_indicators=self.active_indicators,
                     show_liq_ob=self.show_liquidation_ob
-                )
+                ), subtitle=subtitle))
                 # Render Levels Panel separately
-                levels_panel = self.ascii_renderer.render_levels_panel(
-                    self.chart_data,
-                    self.show_liquidation_ob
-                )
+                self.update_levels(chart_key, enabled=True)
             else:
                 # Legacy plotext renderer
-                chart_str = self.plotext_renderer.render(self.chart_data, title, chart_type=self.chart_type)
-                levels_panel = None
+                self.update_panel("chart", chart_key, lambda: Panel(
+                    self.plotext_renderer.sized(self.chart_data, title, chart_type=self.chart_type),
+                    subtitle=subtitle
+                ))
+                self.update_levels(chart_key, enabled=False)
                 
-            self.layout["chart"].update(Panel(chart_str))
             self.layout["chart"].ratio = 1 # Reset to fill available space
-            
-            # Update Levels Layout
-            if levels_panel:
-                self.layout["levels"].update(levels_panel)
-                self.layout["levels"].size = self.levels_height
-            else:
-                self.layout["levels"].update(Panel("")) # Clear it
-                self.layout["levels"].size = 0
                 
         elif not self.show_chart:
              # Chart Hidden -> Show Big Price in its place
-             price = self.live_price or 0
-             change = 0
-             if not self.chart_data.empty:
-                open_price = self.chart_data['open'].iloc[-1]
-                if open_price > 0:
-                    change = ((price - open_price) / open_price) * 100
-            
-             big_price_panel = self.big_price_renderer.render(
+             self.update_panel("chart", chart_key + (self.live_price,), lambda: self.big_price_renderer.render(
                 self.current_coin['symbol'],
-                price,
-                change
-             )
-             
-             self.layout["chart"].update(big_price_panel)
+                self.live_price or 0,
+                self.price_change()
+             ))
              self.layout["chart"].ratio = 1 # Ensure it fills space
              
              # Still show levels if enabled
-             levels_panel = self.ascii_renderer.render_levels_panel(
-                    self.chart_data,
-                    self.show_liquidation_ob
-             )
-             if levels_panel:
-                self.layout["levels"].update(levels_panel)
-                self.layout["levels"].size = self.levels_height
-             else:
-                self.layout["levels"].size = 0
+             self.update_levels(chart_key, enabled=True)
              
         else:
-            self.layout["chart"].update(Panel("Loading Chart or Data Unavailable..."))
-            self.layout["levels"].size = 0
+            self.update_panel("chart", chart_key, lambda: Panel(
+                f"[red]Couldn't load {escape(self.chart_error)}[/red]" if self.chart_error and not self.chart_loading
+                else "Loading Chart or Data Unavailable..."))
+            self.update_levels(chart_key, enabled=False)
 
         # Info Bar
-        price = self.live_price or 0
-        rank = self.current_coin.get('rank', 'N/A')
-        
-        high_24h = self.chart_data['high'].max() if not self.chart_data.empty else 0
-        low_24h = self.chart_data['low'].min() if not self.chart_data.empty else 0
-        vol = self.chart_data['volume'].sum() if not self.chart_data.empty else 0
-        
-        # Display active indicators status
-        ind_status = ",".join(list(self.active_indicators)) if self.active_indicators else "None"
-        if self.show_liquidation_ob:
-            ind_status += ",LIQ/OB"
+        def build_info_bar():
+            price = self.live_price or 0
+            rank = self.current_coin.get('rank', 'N/A')
             
-        info_text = (
-            f"Price: ${price:,.2f} | Rank: #{rank} | "
-            f"High: ${high_24h:,.2f} | Low: ${low_24h:,.2f} | Vol: {vol:,.0f} | "
-            f"TF: {self.timeframe.upper()} | Inds: {ind_status}"
-        )
-        self.layout["info_bar"].update(Panel(info_text))
+            high_24h = self.chart_data['high'].max() if not self.chart_data.empty else 0
+            low_24h = self.chart_data['low'].min() if not self.chart_data.empty else 0
+            vol = self.chart_data['volume'].sum() if not self.chart_data.empty else 0
+            
+            # Display active indicators status
+            ind_status = ",".join(list(self.active_indicators)) if self.active_indicators else "None"
+            if self.show_liquidation_ob:
+                ind_status += ",LIQ/OB"
+                
+            info_text = (
+                f"Price: ${price:,.2f} | Rank: #{rank} | "
+                f"High: ${high_24h:,.2f} | Low: ${low_24h:,.2f} | Vol: {vol:,.0f} | "
+                f"TF: {self.timeframe.upper()} | Inds: {ind_status}"
+            )
+            return Panel(info_text)
+        self.update_panel("info_bar", (self.live_price, self.current_coin.get('rank'), self.chart_version,
+                                       self.timeframe, frozenset(self.active_indicators),
+                                       self.show_liquidation_ob), build_info_bar)
 
         # Sidebar
-        self.layout["sidebar"].update(create_watchlist_table(self.watchlist_data))
+        if self.sidebar_mode == 'Screener':
+            progress = (self.screener.done, self.screener.total)
+            self.update_panel("sidebar", (self.watchlist_version, self.sidebar_mode, progress, self.screener_error),
+                              lambda: create_screener_table(self.watchlist_data, progress, self.screener_error))
+        else:
+            loading = self.watchlist_loading
+            self.update_panel("sidebar", (self.watchlist_version, self.tickers.version, self.sidebar_mode, loading),
+                              lambda: create_watchlist_table(self.watchlist_data, loading, self.tickers))
         
-        # Apply Dynamic Ratios
-        self.layout["chart_area"].ratio = self.chart_ratio
-        self.layout["sidebar"].ratio = self.sidebar_ratio
+        # Apply Dynamic Ratios (and redraw after a terminal resize)
+        layout_key = (self.chart_ratio, self.sidebar_ratio, self.layout["levels"].size, size)
+        if self._panel_keys.get("layout") != layout_key:
+            self._panel_keys["layout"] = layout_key
+            self.layout["chart_area"].ratio = self.chart_ratio
+            self.layout["sidebar"].ratio = self.sidebar_ratio
+            self.ui_changed = True
         
         # Footer / Controls
         controls = (
             "\\[S] Search  \\[1-9] Select  \\[H,4,D,W,M,Y] TF  \\[M] Min TF  \\[I] Ind Menu  \\[O] Liq/OB  \\[F] Fav  "
-            "\\[T] Trend  \\[G] Gain  \\[L] Lose  \\[C] Chart Mode  \\[X] Hide Chart  \\[<,>] Resize Sidebar  \\[[,]] Resize Levels  \\[?] Help  \\[Q] Quit"
+            "\\[T] Trend  \\[G] Gain  \\[L] Lose  \\[N] Screener  \\[C] Chart Mode  \\[X] Hide Chart  \\[<,>] Resize Sidebar  \\[[,]] Resize Levels  \\[?] Help  \\[Q] Quit"
         )
-        self.layout["footer"].update(Panel(controls, title="Controls"))
+        self.update_panel("footer", controls, lambda: Panel(controls, title="Controls"))
 
         return self.layout
 
@@ -363,7 +746,7 @@ class CryptoTracker:
         elif choice == '3': self.timeframe = '15m'
         elif choice == '4': self.timeframe = '30m'
         
-        await self.update_current_coin_data()
+        self.load_chart()
             
         input_handler.__enter__()
         live_ctx.start()
@@ -398,142 +781,221 @@ class CryptoTracker:
             else: self.active_indicators.add('rsi')
         elif choice == '5':
             self.active_indicators.clear()
+
+        if not self.chart_data.empty:
+            self.chart_data = self.apply_indicators(self.chart_data)
             
         # Restart live mode
         input_handler.__enter__()
         live_ctx.start()
 
+    async def handle_key(self, key: str, live, input_handler):
+        """Dispatches one key press."""
+        if key.lower() == 'q':
+            self.is_running = False
+        elif key.lower() == 's':
+            live.stop()
+            input_handler.__exit__(None, None, None)
+            search = SearchModal(self.cache)
+            result = await search.show()
+            if result:
+                self.current_coin = result
+                self.load_chart()
+            input_handler.__enter__()
+            live.start()
+        
+        elif key in ["'", "?"]:
+            live.stop()
+            input_handler.__exit__(None, None, None)
+            
+            help_modal = HelpModal()
+            # Temporarily clear screen or just print over
+            console = Console()
+            console.clear()
+            console.print(help_modal.render())
+            
+            input() # Wait for any key (enter)
+            
+            input_handler.__enter__()
+            live.start()
+
+        elif key == ',' or key == '<':
+            # Shrink Sidebar / Grow Chart
+            if self.sidebar_ratio > 1:
+                self.sidebar_ratio -= 1
+                self.chart_ratio += 1
+                
+        elif key == '.' or key == '>':
+            # Grow Sidebar / Shrink Chart
+            if self.chart_ratio > 1:
+                self.sidebar_ratio += 1
+                self.chart_ratio -= 1
+                
+        elif key == '[':
+             # Shrink Levels Panel
+             if self.levels_height > 3:
+                 self.levels_height -= 1
+                 
+        elif key == ']':
+             # Grow Levels Panel
+             if self.levels_height < 40:
+                 self.levels_height += 1
+
+        elif key in [str(i) for i in range(1, 10)]:
+            idx = int(key) - 1
+            if idx < len(self.watchlist_data):
+                w_coin = self.watchlist_data[idx]
+                if 'pair' in w_coin:
+                    # Screener / live mover rows only carry the Binance pair
+                    w_coin = await self.coin_for_symbol(w_coin['symbol']) or w_coin
+                self.current_coin = {
+                    'id': w_coin['id'],
+                    'symbol': w_coin['symbol'],
+                    'name': w_coin['name'],
+                    'rank': w_coin.get('market_cap_rank') or w_coin.get('rank', 0)
+                }
+                self.load_chart()
+        
+        elif key.lower() in ['h', '4', 'd', 'w', 'm', 'y']:
+            map_tf = {'h':'1h', '4':'4h', 'd':'1d', 'w':'1w', 'm':'1m', 'y':'1y'}
+            self.timeframe = map_tf[key.lower()]
+            self.load_chart()
+        
+        elif key.lower() == 'i':
+            await self.toggle_indicator_menu(live, input_handler)
+        
+        elif key.lower() == 'o':
+            self.show_liquidation_ob = not self.show_liquidation_ob
+            if not self.chart_data.empty:
+                self.chart_data = self.apply_indicators(self.chart_data)
+            
+        elif key.lower() == 'f':
+            favorites = await self.db.get_favorites()
+            if self.current_coin['id'] in favorites:
+                await self.db.remove_favorite(self.current_coin['id'])
+            else:
+                await self.db.add_favorite(self.current_coin['id'])
+        
+        elif key.lower() == 'v':
+            self.sidebar_mode = 'Favorites'
+            self.load_watchlist()
+                
+        elif key.lower() == 't':
+            self.sidebar_mode = 'Trending'
+            self.load_watchlist()
+            
+        elif key.lower() == 'g':
+            self.sidebar_mode = 'Gainers'
+            self.load_watchlist()
+            
+        elif key.lower() == 'l':
+            self.sidebar_mode = 'Losers'
+            self.load_watchlist()
+            
+        elif key.lower() == 'n':
+            self.sidebar_mode = 'Screener'
+            self.load_watchlist()
+
+        elif key.lower() == 'c':
+            # Cycle chart types: ascii -> candle (plotext) -> line (plotext)
+            if self.chart_type == 'ascii':
+                self.chart_type = 'candle'
+            elif self.chart_type == 'candle':
+                self.chart_type = 'line'
+            else:
+                self.chart_type = 'ascii'
+                
+        elif key.lower() == 'x':
+            self.show_chart = not self.show_chart
+            
+        elif key.lower() == 'm':
+            await self.toggle_minute_menu(live, input_handler)
+            
+        elif key.lower() == 'p':
+            if self.view_mode == 'standard':
+                self.view_mode = 'big_price'
+            else:
+                self.view_mode = 'standard'
+
+    def request_redraw(self):
+        """Wakes the main loop (new data, finished load, resize)."""
+        if self.wake:
+            self.wake.set()
+
+    def on_key(self, key: str):
+        self.keys.append(key)
+        self.wake.set()
+
     async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.wake = asyncio.Event()
         await self.initialize()
+        self.refresh_task = asyncio.create_task(self.refresh_watchlist_periodically())
+        frame_interval = 1 / config.MAX_FPS
         
         with InputHandler() as input_handler:
-            with Live(self.render_ui(), refresh_per_second=4, screen=True) as live:
+            # Keys arrive through the event loop where possible (POSIX);
+            # otherwise fall back to polling every POLL_INTERVAL
+            event_driven = input_handler.attach(self.loop, self.on_key)
+            if hasattr(signal, 'SIGWINCH'):
+                self.loop.add_signal_handler(signal.SIGWINCH, self.request_redraw)
+            # Redrawn only when render_ui() reports a change
+            with Live(self.render_ui(), auto_refresh=False, screen=True) as live:
+                last_frame = 0.0
                 while self.is_running:
-                    key = input_handler.get_key()
-                    if key:
-                        if key.lower() == 'q':
-                            self.is_running = False
-                        elif key.lower() == 's':
-                            live.stop()
-                            input_handler.__exit__(None, None, None)
-                            coins = self.cache.get_all_coins()
-                            search = SearchModal(coins)
-                            result = await search.show()
-                            if result:
-                                self.current_coin = result
-                                await self.update_current_coin_data()
-                            input_handler.__enter__()
-                            live.start()
-                        
-                        elif key in ["'", "?"]:
-                            live.stop()
-                            input_handler.__exit__(None, None, None)
-                            
-                            help_modal = HelpModal()
-                            # Temporarily clear screen or just print over
-                            console = Console()
-                            console.clear()
-                            console.print(help_modal.render())
-                            
-                            input() # Wait for any key (enter)
-                            
-                            input_handler.__enter__()
-                            live.start()
-
-                        elif key == ',' or key == '<':
-                            # Shrink Sidebar / Grow Chart
-                            if self.sidebar_ratio > 1:
-                                self.sidebar_ratio -= 1
-                                self.chart_ratio += 1
-                                
-                        elif key == '.' or key == '>':
-                            # Grow Sidebar / Shrink Chart
-                            if self.chart_ratio > 1:
-                                self.sidebar_ratio += 1
-                                self.chart_ratio -= 1
-                                
-                        elif key == '[':
-                             # Shrink Levels Panel
-                             if self.levels_height > 3:
-                                 self.levels_height -= 1
-                                 
-                        elif key == ']':
-                             # Grow Levels Panel
-                             if self.levels_height < 40:
-                                 self.levels_height += 1
-
-                        elif key in [str(i) for i in range(1, 10)]:
-                            idx = int(key) - 1
-                            if idx < len(self.watchlist_data):
-                                w_coin = self.watchlist_data[idx]
-                                self.current_coin = {
-                                    'id': w_coin['id'],
-                                    'symbol': w_coin['symbol'],
-                                    'name': w_coin['name'],
-                                    'rank': w_coin.get('market_cap_rank', 0)
-                                }
-                                await self.update_current_coin_data()
-                        
-                        elif key.lower() in ['h', '4', 'd', 'w', 'm', 'y']:
-                            map_tf = {'h':'1h', '4':'4h', 'd':'1d', 'w':'1w', 'm':'1m', 'y':'1y'}
-                            self.timeframe = map_tf[key.lower()]
-                            await self.update_current_coin_data()
-                        
-                        elif key.lower() == 'i':
-                            await self.toggle_indicator_menu(live, input_handler)
-                        
-                        elif key.lower() == 'o':
-                            self.show_liquidation_ob = not self.show_liquidation_ob
-                            
-                        elif key.lower() == 'f':
-                            favorites = self.cache.get_favorites()
-                            if self.current_coin['id'] in favorites:
-                                self.cache.remove_favorite(self.current_coin['id'])
-                            else:
-                                self.cache.add_favorite(self.current_coin['id'])
-                        
-                        elif key.lower() == 'v':
-                            self.sidebar_mode = 'Favorites'
-                            await self.update_watchlist()
-                                
-                        elif key.lower() == 't':
-                            self.sidebar_mode = 'Trending'
-                            await self.update_watchlist()
-                            
-                        elif key.lower() == 'g':
-                            self.sidebar_mode = 'Gainers'
-                            await self.update_watchlist()
-                            
-                        elif key.lower() == 'l':
-                            self.sidebar_mode = 'Losers'
-                            await self.update_watchlist()
-                            
-                        elif key.lower() == 'c':
-                            # Cycle chart types: ascii -> candle (plotext) -> line (plotext)
-                            if self.chart_type == 'ascii':
-                                self.chart_type = 'candle'
-                            elif self.chart_type == 'candle':
-                                self.chart_type = 'line'
-                            else:
-                                self.chart_type = 'ascii'
-                                
-                        elif key.lower() == 'x':
-                            self.show_chart = not self.show_chart
-                            
-                        elif key.lower() == 'm':
-                            await self.toggle_minute_menu(live, input_handler)
-                            
-                        elif key.lower() == 'p':
-                            if self.view_mode == 'standard':
-                                self.view_mode = 'big_price'
-                            else:
-                                self.view_mode = 'standard'
-
-                    live.update(self.render_ui())
-                    await asyncio.sleep(0.1)
+                    if event_driven:
+                        await self.wake.wait()
+                    else:
+                        try:
+                            await asyncio.wait_for(self.wake.wait(), config.POLL_INTERVAL)
+                        except asyncio.TimeoutError:
+                            pass
+                        key = input_handler.get_key()
+                        if key:
+                            self.keys.append(key)
+                    self.wake.clear()
+
+                    pressed = bool(self.keys)
+                    while self.keys and self.is_running:
+                        await self.handle_key(self.keys.popleft(), live, input_handler)
+
+                    self.sync_streams()
+                    layout = self.render_ui()
+                    # Any key also redraws: modals (search, help, menus) leave the screen stale
+                    if self.ui_changed or pressed:
+                        # Frame cap: bursts of updates coalesce into one paint
+                        delay = last_frame + frame_interval - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                            layout = self.render_ui()
+                        live.update(layout, refresh=True)
+                        last_frame = time.monotonic()
+
+            input_handler.detach()
+            if hasattr(signal, 'SIGWINCH'):
+                self.loop.remove_signal_handler(signal.SIGWINCH)
             
+        for task in (self.screener_task, self.chart_task, self.watchlist_task, self.refresh_task):
+            if task:
+                task.cancel()
+        if self.ws:
+            await self.ws.stop()
+
+        net = self.http.stats()
+        dedup = self.http.singleflight.stats()
+        await self.http.close()
+        self.db.close()
+        self.console.print(
+            f"[dim]HTTP: {net['requests']} requests, {net['connections_created']} connections opened, "
+            f"{net['connections_reused']} reused, avg handshake {net['avg_handshake_ms']:.1f}ms, "
+            f"{dedup['deduplicated']} duplicate calls coalesced[/dim]"
+        )
         if self.ws:
-            self.ws.stop()
+            ws = self.ws.stats()
+            self.console.print(
+                f"[dim]WebSocket: {ws['received']} messages, {ws['coalesced']} coalesced, {ws['dropped']} dropped, "
+                f"{ws['reconnects']} reconnects[/dim]"
+            )
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from rich.console import Console
+from crypto_tracker.api.binance import BinanceAPI, INTERVAL_MS
+from crypto_tracker.api.cache import CacheManager, AsyncCacheManager
+from crypto_tracker.api.candles import CandleStore
+from crypto_tracker.api.http_client import HttpClient
+from crypto_tracker.api.response_cache import ResponseCache
+from crypto_tracker.api.scheduler import PRIORITY_PREFETCH
+from crypto_tracker.ui.watchlist import create_screener_table
+from crypto_tracker.utils import config
+from crypto_tracker.utils.screener import Screener, SIGNALS
+
+async def run_screener(args):
+    console = Console()
+    cache = CacheManager()
+    db = AsyncCacheManager(cache)
+    http = HttpClient(cache=ResponseCache(store=db))
+    await http.start()
+    try:
+        async with BinanceAPI(http) as bn:
+            pairs = [p['symbol'] for p in await bn.get_exchange_info(priority=PRIORITY_PREFETCH)]
+        if args.limit:
+            pairs = pairs[:args.limit]
+
+        screener = Screener(CandleStore(db, http), interval=args.interval, history=args.history)
+        started = time.perf_counter()
+        with console.status(f"Scanning {len(pairs)} pairs ({args.interval})..."):
+            results = await screener.scan(pairs, args.signals)
+        elapsed = time.perf_counter() - started
+    finally:
+        net = http.stats()
+        await http.close()
+        db.close()
+
+    console.print(create_screener_table(results[:args.top]))
+    console.print(f"[dim]{len(results)} of {len(pairs)} pairs matched in {elapsed:.1f}s "
+                  f"({net['requests']} HTTP requests)[/dim]")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan Binance USDT pairs for indicator signals.")
+    parser.add_argument('-i', '--interval', default=config.SCREENER_INTERVAL, choices=sorted(INTERVAL_MS),
+                        help="candle interval (default: %(default)s)")
+    parser.add_argument('-n', '--top', type=int, default=25, help="rows to show (default: %(default)s)")
+    parser.add_argument('-s', '--signals', nargs='+', choices=list(SIGNALS), metavar='SIGNAL',
+                        help="only these signals: " + ", ".join(SIGNALS))
+    parser.add_argument('--history', type=int, default=config.SCREENER_HISTORY,
+                        help="candles per pair (default: %(default)s)")
+    parser.add_argument('--limit', type=int, default=0, help="scan only the first N pairs")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_screener(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()